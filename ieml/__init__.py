@@ -1,24 +1,69 @@
-import logging
-from configparser import ExtendedInterpolation
 import os
-from os.path import isfile, isdir, expanduser, join, dirname
-import configparser
-import sys
-
-from appdirs import user_cache_dir, user_data_dir
+from os.path import join, dirname
 
 from ieml.constants import LIBRARY_VERSION
 
-_config = configparser.ConfigParser(interpolation=ExtendedInterpolation())
-_config.read(join(dirname(__file__), 'default_config.conf'))
+# Importing ieml has no side effect : the configuration is read on the first get_configuration call, the logging is
+# configured by the application with init_logging, the folders are created by the code that writes in them, and the
+# attributes of _LAZY_ATTRIBUTES are computed on first access (PEP 562).
+
+_config = None
+
+
+def _versions_folder():
+    from appdirs import user_data_dir
+    return os.path.join(user_data_dir(appname='ieml', appauthor=False, version=LIBRARY_VERSION), 'dictionary_versions')
+
+
+def _cache_folder(name):
+    def _folder():
+        from appdirs import user_cache_dir
+        return os.path.join(user_cache_dir(appname='ieml', appauthor=False, version=LIBRARY_VERSION), name)
+
+    return _folder
+
+
+def _parse_many():
+    from ieml.parsing import parse_many
+    return parse_many
+
 
-VERSIONS_FOLDER = os.path.join(user_data_dir(appname='ieml', appauthor=False, version=LIBRARY_VERSION), 'dictionary_versions')
+_LAZY_ATTRIBUTES = {
+    'VERSIONS_FOLDER': _versions_folder,
+    'CACHE_VERSIONS_FOLDER': _cache_folder('cached_dictionary_versions'),
+    'PARSER_FOLDER': _cache_folder('parsers'),
+    # parse a list of ieml strings in a process pool, see ieml.parsing.parse_many
+    'parse_many': _parse_many,
+}
 
-CACHE_VERSIONS_FOLDER = os.path.join(user_cache_dir(appname='ieml', appauthor=False, version=LIBRARY_VERSION), 'cached_dictionary_versions')
-PARSER_FOLDER = os.path.join(user_cache_dir(appname='ieml', appauthor=False, version=LIBRARY_VERSION), 'parsers')
 
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        value = _LAZY_ATTRIBUTES[name]()
+        globals()[name] = value
+        return value
+
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
+
+def init_logging(config=None):
+    """
+    Add the handlers of the configuration to the root logger : stdout at the configured level, and the log file if
+    one is configured.
+
+    :param config: the configuration, get_configuration() by default
+    """
+    import configparser
+    import logging
+    import sys
+
+    if config is None:
+        config = get_configuration()
 
-def init_logging(config):
     level = getattr(logging, config.get('DEFAULT', 'loglevel').upper())
     if not isinstance(level, int):
         raise ValueError('Invalid log level: %s' % level)
@@ -43,19 +88,17 @@ def init_logging(config):
     root.addHandler(ch)
 
 
-if not isdir(VERSIONS_FOLDER):
-    os.makedirs(VERSIONS_FOLDER)
-
-if not isdir(PARSER_FOLDER):
-    os.makedirs(PARSER_FOLDER)
+def get_configuration():
+    global _config
 
-if not isdir(CACHE_VERSIONS_FOLDER):
-    os.makedirs(CACHE_VERSIONS_FOLDER)
+    if _config is None:
+        import configparser
 
-# if isfile(_config_file):
-#     _config.read(_config_file)
+        config = configparser.ConfigParser(interpolation=configparser.ExtendedInterpolation())
+        config.read(join(dirname(__file__), 'default_config.conf'))
 
-init_logging(_config)
+        # if isfile(_config_file):
+        #     _config.read(_config_file)
+        _config = config
 
-def get_configuration():
     return _config
@@ -1,3 +1,7 @@
+import copy
+import os
+import threading
+from collections import OrderedDict, namedtuple
 
 
 class cached_property:
@@ -11,6 +15,26 @@ class cached_property:
         return attr
 
 
+class locked_cached_property(cached_property):
+    """
+    cached_property computed once when several threads access it. The factories of an instance run under a reentrant
+    lock of the instance, a factory can access the other properties of the instance.
+    """
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+
+        # setdefault is atomic, the threads get the same lock
+        lock = instance.__dict__.get('_properties_lock') or \
+            instance.__dict__.setdefault('_properties_lock', threading.RLock())
+
+        with lock:
+            if self._attr_name in instance.__dict__:
+                return instance.__dict__[self._attr_name]
+
+            return super().__get__(instance, owner)
+
+
 class TreeStructure:
     def __init__(self):
         self._str = None
@@ -60,4 +84,121 @@ class Singleton(type):
 
             cls._instances[cls] = super(Singleton, cls).__call__(*args, **kwargs)
 
-        return cls._instances[cls]
\ No newline at end of file
+        return cls._instances[cls]
+
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+
+class LRUCache:
+    """
+    Thread-safe bounded cache of the results of a function, the least recently used entries are evicted first.
+    The lock is only held to read and update the entries, not while a missing value is computed : two threads missing
+    the same key both compute it. The exceptions are not cached.
+    """
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, compute):
+        """
+        :param key: the key of the value
+        :param compute: the function that computes the value of a missing key
+        :return: the value of the key
+        """
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return self._entries[key]
+
+            self.misses += 1
+
+        value = compute(key)
+
+        with self._lock:
+            self._entries[key] = value
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+        return value
+
+    def resize(self, maxsize: int) -> None:
+        """Change the maximum number of entries, the least recently used entries above it are evicted."""
+        with self._lock:
+            self.maxsize = maxsize
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def cache_info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
+
+    def cache_clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+class ThreadLocalParser:
+    """
+    Give each thread its own copy of a PLY parser and lexer. The PLY parser and lexer have an internal state (the
+    parsing stack, the lexer position), they cannot be shared by concurrent threads. The copies share the parsing
+    tables with the original ones, so the threads parse concurrently without a lock.
+    """
+    def __init__(self, parser, lexer):
+        self._parser = parser
+        self._lexer = lexer
+        self._local = threading.local()
+
+    def parse(self, s, **kwargs):
+        local = self._local
+        if not hasattr(local, 'parser'):
+            local.parser = copy.copy(self._parser)
+            local.lexer = self._lexer.clone()
+
+        return local.parser.parse(s, lexer=local.lexer, **kwargs)
+
+
+def load_yaml(file: str):
+    """
+    :param file: a yaml file
+    :return: the content of the file, read with the safe loader
+    """
+    import yaml
+
+    # the libyaml loader is about ten times faster than the python one, pyyaml can be built without it
+    with open(file) as fp:
+        return yaml.load(fp, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
+
+
+def map_files(function, files, workers: int = 1) -> list:
+    """
+    Apply function to each file, in the current process or in a process pool.
+
+    The pool is opt-in : on the platforms that spawn the worker processes (macOS, Windows), each worker imports the
+    __main__ module of the caller, whose entry point must then be guarded by `if __name__ == '__main__':`.
+
+    :param function: a picklable function of a file, with a picklable result
+    :param files: the files
+    :param workers: the number of worker processes, the cpu count if None. If 1, the default, the files are read in
+    the current process.
+    :return: the list of the results in the order of files
+    """
+    files = list(files)
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    workers = min(workers, len(files))
+    if workers <= 1:
+        return [function(f) for f in files]
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(function, files, chunksize=-(-len(files) // (workers * 4))))
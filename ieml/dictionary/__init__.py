@@ -1 +1,11 @@
-from .dictionary import Dictionary
\ No newline at end of file
+# the dictionary module imports scipy and the relations, it is imported on the first access of Dictionary (PEP 562),
+# importing the scripts does not load it
+
+
+def __getattr__(name):
+    if name == 'Dictionary':
+        from .dictionary import Dictionary
+        globals()[name] = Dictionary
+        return Dictionary
+
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
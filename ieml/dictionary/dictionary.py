@@ -1,18 +1,22 @@
 import hashlib
+import json
 from typing import List, Dict
 
-import dill
-
 import sys
 
-from ieml.constants import LANGUAGES, DICTIONARY_FOLDER
-from ieml.dictionary.relation.relations import RelationsGraph
-from ieml.dictionary.script import script
+from ieml.commons import locked_cached_property, load_yaml, map_files
+from ieml.constants import LANGUAGES, DICTIONARY_FOLDER, character_value
+from ieml.dictionary.relation.relations import RelationsGraph, RELATIONS
+from ieml.dictionary.search import SearchIndex
+from ieml.dictionary.snapshot import DictionarySnapshot, write_snapshot, tables_sections
+from ieml.dictionary.script import script, script_sort_key, AdditiveScript
 import numpy as np
+from scipy.sparse import csr_matrix, identity
 
 from collections import namedtuple
 import os
-import yaml
+import weakref
+import time
 
 from ieml.dictionary.table.table_structure import TableStructure
 
@@ -27,10 +31,14 @@ Comments.__getitem__ = lambda self, item: self.__getattribute__(item) if item in
 
 
 class FolderWatcherCache:
+    # bumped when the layout of the cached objects changes, so the caches written by older versions are pruned
+    FORMAT_VERSION = 6
+
     def __init__(self, folder: str, cache_folder: str):
         """
         Cache that check if `folder` content has changed. Compute a hash of the files in the folder and
-        get pruned if the content of this folder change.
+        get pruned if the content of this folder change. The content is only read when the name, size or
+        modification time of a file has changed.
 
         :param folder: the folder to watch
         :param cache_folder: the folder to put the cache file
@@ -38,56 +46,340 @@ class FolderWatcherCache:
         self.folder = folder
         self.cache_folder = os.path.abspath(cache_folder)
 
-    def update(self, obj) -> None:
+        # the (stats, content hash) of the last computed cache file, it is recomputed when the stats change
+        self._fingerprint = None
+
+    def update(self, dictionary: 'Dictionary') -> str:
         """
         Update the cache content, remove old cache files from the cache directory.
 
-        :param obj: the object to pickle in the cache
-        :return: None
+        :param dictionary: the dictionary to write in the cache snapshot
+        :return: the written cache file
         """
         for c in self._cache_candidates():
             os.remove(c)
 
-        with open(self.cache_file, 'wb') as fp:
-            dill.dump(obj, fp)
+        cache_file = self.cache_file
+        write_snapshot(dictionary, cache_file)
+        return cache_file
 
-    def get(self) -> object:
+    def get(self, cache_file: str = None) -> 'Dictionary':
         """
-        Unpickle and return the object stored in the cache file.
-        :return: the stored object
+        Return the dictionary of the cache snapshot, read through a memory map.
+        :param cache_file: the cache file if already computed, each computation scans the watched folder
+        :return: the stored dictionary
         """
-        with open(self.cache_file, 'rb') as fp:
-            return dill.load(fp)
+        return Dictionary.from_snapshot(cache_file or self.cache_file)
 
-    def is_pruned(self) -> bool:
+    def is_pruned(self, cache_file: str = None) -> bool:
         """
         Return True if the watched folder content has changed.
+        :param cache_file: the cache file if already computed, see get
         :return: if the folder content changed
         """
         names = [p for p in self._cache_candidates()]
         if len(names) != 1:
             return True
 
-        return self.cache_file != names[0]
+        return (cache_file or self.cache_file) != names[0]
 
     @property
     def cache_file(self) -> str:
         """
         :return: The cache file absolute path
         """
-        res = b""
-        for file in sorted(os.listdir(self.folder)):
+        stats = self._stats()
+        if self._fingerprint is None or self._fingerprint[0] != stats:
+            self._fingerprint = (stats, self._content_hash(stats))
+
+        return os.path.join(self.cache_folder, ".dictionary-cache.{}".format(self._fingerprint[1]))
+
+    def _stats(self) -> List[List]:
+        """
+        :return: the sorted [name, size, mtime_ns] of the files of the watched folder
+        """
+        stats = []
+        for entry in os.scandir(self.folder):
+            if entry.is_file():
+                stat = entry.stat()
+                stats.append([entry.name, stat.st_size, stat.st_mtime_ns])
+
+        return sorted(stats)
+
+    @property
+    def _fingerprint_file(self) -> str:
+        """
+        :return: the file that records the content hash of the folder for its files stats
+        """
+        folder_hash = hashlib.md5(os.path.abspath(self.folder).encode('utf8')).hexdigest()
+        return os.path.join(self.cache_folder, ".dictionary-fingerprint.{}".format(folder_hash))
+
+    def _content_hash(self, stats: List[List]) -> str:
+        """
+        Hash the content of the files, unless the fingerprint file has recorded the hash for the same stats.
+
+        :param stats: the stats of the files of the folder
+        :return: the hash of the files content
+        """
+        try:
+            with open(self._fingerprint_file) as fp:
+                fingerprint = json.load(fp)
+
+            if fingerprint['version'] == self.FORMAT_VERSION and fingerprint['stats'] == stats:
+                return fingerprint['hash']
+        except (OSError, ValueError, KeyError):
+            pass
+
+        res = hashlib.md5("version:{}".format(self.FORMAT_VERSION).encode('utf8'))
+        for file, _, _ in stats:
+            res.update(file.encode('utf8') + b":")
             with open(os.path.join(self.folder, file), 'rb') as fp:
-                res += file.encode('utf8') + b":" + fp.read()
+                for chunk in iter(lambda: fp.read(1 << 16), b''):
+                    res.update(chunk)
+
+        fingerprint = {'version': self.FORMAT_VERSION, 'stats': stats, 'hash': res.hexdigest()}
+        try:
+            tmp_file = '{}.{}.tmp'.format(self._fingerprint_file, os.getpid())
+            with open(tmp_file, 'w') as fp:
+                json.dump(fingerprint, fp)
+            os.replace(tmp_file, self._fingerprint_file)
+        except OSError:
+            # the hash is recomputed by the next load
+            pass
 
-        return os.path.join(self.cache_folder, ".dictionary-cache.{}".format(hashlib.md5(res).hexdigest()))
+        return fingerprint['hash']
 
     def _cache_candidates(self) -> List[str]:
         """
         Return all the cache files from the cache folder (the pruned and the current one)
         :return: All the cache files from the cache folder
         """
-        return [os.path.join(self.cache_folder, n) for n in os.listdir(self.cache_folder) if n.startswith('.dictionary-cache.')]
+        return [os.path.join(self.cache_folder, n) for n in os.listdir(self.cache_folder)
+                if n.startswith('.dictionary-cache.') and not n.endswith('.tmp')]
+
+
+class RootBlocksCache:
+    """
+    Cache of the parts of a dictionary build, to recompute only the changed root paradigms when the dictionary folder
+    changes :
+     - the content of each dictionary file (see read_dictionary_file), keyed by the hash of the file,
+     - the tables and the relations of each root paradigm, keyed by the hash of the root paradigm, its paradigms and
+       its inhibitions.
+
+    The tables and the relations other than father/child and identity only link the scripts of a same root paradigm,
+    they are computed on the root paradigm alone then stitched in the matrices of the dictionary. The father/child
+    relations cross the root paradigms, they are computed on the whole dictionary.
+    """
+    # bumped when the layout of the cached files changes
+    FORMAT_VERSION = 1
+
+    # the relations computed per root paradigm
+    BLOCK_RELATIONS = ['contains', 'opposed', 'associated', 'crossed', 'twin'] + ['table_%d' % i for i in range(6)]
+
+    def __init__(self, cache_folder: str):
+        """
+        :param cache_folder: the folder where the cache folder (.dictionary-blocks) is created
+        """
+        self.folder = os.path.join(os.path.abspath(cache_folder), '.dictionary-blocks')
+        os.makedirs(self.folder, exist_ok=True)
+
+        # the names of the cache files used since the creation of the cache, the other are removed by prune
+        self._used = set()
+        # the root paradigms recomputed since the creation of the cache
+        self.computed = []
+        # dictionary -> (blocks, the builders that have not read them yet), the blocks are loaded once for the
+        # tables and the relations
+        self._loaded = weakref.WeakKeyDictionary()
+
+    def _hash(self, data: bytes) -> str:
+        return hashlib.md5("version:{}:".format(self.FORMAT_VERSION).encode('utf8') + data).hexdigest()
+
+    def _write(self, name: str, write) -> None:
+        tmp_file = os.path.join(self.folder, '{}.{}.tmp'.format(name, os.getpid()))
+        with open(tmp_file, 'wb') as fp:
+            write(fp)
+        os.replace(tmp_file, os.path.join(self.folder, name))
+
+    def read_files(self, files: List[str], workers: int = 1) -> List[dict]:
+        """
+        :param files: the dictionary yaml files
+        :param workers: the number of processes to read the files missing from the cache, see read_dictionary_files
+        :return: the content of each file, as read_dictionary_file
+        """
+        contents = {}
+        names = {}
+        for file in files:
+            with open(file, 'rb') as fp:
+                names[file] = 'file.{}.json'.format(self._hash(fp.read()))
+
+            self._used.add(names[file])
+            try:
+                with open(os.path.join(self.folder, names[file]), encoding='utf8') as fp:
+                    contents[file] = json.load(fp)
+            except (OSError, ValueError):
+                pass
+
+        missing = [f for f in files if f not in contents]
+        for file, content in zip(missing, read_dictionary_files(missing, workers=workers)):
+            self._write(names[file], lambda fp: fp.write(json.dumps(content).encode('utf8')))
+            contents[file] = content
+
+        return [contents[f] for f in files]
+
+    def _blocks(self, dictionary: 'Dictionary', builder: str):
+        """
+        :param dictionary: the dictionary, with its scripts, index, roots_idx and _inhibitions
+        :param builder: 'tables' or 'relations', the blocks are released when both have read them
+        :return: the list of the (block indices -> dictionary indices array, block) of the root paradigms
+        """
+        if dictionary not in self._loaded:
+            roots = dictionary.scripts[np.where(dictionary.roots_idx)]
+            paradigms = TableStructure.assign_paradigms(roots, dictionary.scripts)
+
+            blocks = []
+            for root in roots:
+                scripts = sorted({root, *root.singular_sequences, *paradigms[root]}, key=script_sort_key)
+                block = self._block(root, scripts, dictionary._inhibitions[root])
+                blocks.append((np.array([dictionary.index[s] for s in scripts]), block))
+
+            self._loaded[dictionary] = (blocks, {'tables', 'relations'})
+
+        blocks, pending = self._loaded[dictionary]
+        pending.discard(builder)
+        if not pending:
+            del self._loaded[dictionary]
+
+        return blocks
+
+    def tables(self, dictionary: 'Dictionary') -> TableStructure:
+        """
+        :param dictionary: the dictionary, with its scripts, index, roots_idx and _inhibitions
+        :return: the table structure of the dictionary
+        """
+        tables = [[], [], []]
+        n_tables = 0
+        for index, block in self._blocks(dictionary, 'tables'):
+            tables[0].append(index[block['tables_script']])
+            tables[1].append(np.where(block['tables_parent'] >= 0, block['tables_parent'] + n_tables, -1))
+            tables[2].append(block['tables_regular'])
+            n_tables += len(block['tables_script'])
+
+        scripts, parents, regular = (np.concatenate(a) for a in tables)
+        return TableStructure.from_parents(dictionary.scripts[scripts], parents.tolist(), regular.tolist())
+
+    def relations(self, dictionary: 'Dictionary') -> RelationsGraph:
+        """
+        :param dictionary: the dictionary, with its scripts, index, roots_idx and _inhibitions
+        :return: the relations graph of the dictionary
+        """
+        relations = {r: ([], []) for r in self.BLOCK_RELATIONS}
+        for index, block in self._blocks(dictionary, 'relations'):
+            for r in self.BLOCK_RELATIONS:
+                relations[r][0].append(index[block[r + '_row']])
+                relations[r][1].append(index[block[r + '_col']])
+
+        shape = [len(dictionary)] * 2
+        matrices = {}
+        for r, (row, col) in relations.items():
+            row, col = np.concatenate(row), np.concatenate(col)
+            matrices[r] = csr_matrix((np.ones(len(row), dtype=bool), (row, col)), shape=shape)
+
+        matrices['contained'] = csr_matrix(matrices['contains'].transpose())
+
+        father = RelationsGraph._compute_father(dictionary)
+        for i, r in enumerate(['_substance', '_attribute', '_mode']):
+            matrices['father' + r] = csr_matrix(father[i])
+            matrices['child' + r] = csr_matrix(father[i].transpose())
+
+        matrices['identity'] = identity(len(dictionary), format='csr')
+
+        return RelationsGraph.from_matrices(dictionary, {r: matrices[r] for r in RELATIONS})
+
+    def _block(self, root, scripts, inhibitions) -> Dict[str, np.ndarray]:
+        """
+        :param root: the root paradigm
+        :param scripts: the sorted scripts of the root paradigm
+        :param inhibitions: the inhibitions of the root paradigm
+        :return: the arrays of the tables (see snapshot.tables_sections) and of the (row, col) of the relations of
+        the root paradigm, indices in scripts
+        """
+        key = json.dumps([str(root), [str(s) for s in scripts], sorted(inhibitions)])
+        name = 'root.{}.npz'.format(self._hash(key.encode('utf8')))
+
+        self._used.add(name)
+        try:
+            with np.load(os.path.join(self.folder, name)) as block:
+                return dict(block)
+        except (OSError, ValueError):
+            pass
+
+        self.computed.append(root)
+
+        # the dictionary of the root paradigm alone
+        block = Dictionary.__new__(Dictionary)
+        block.scripts = np.array(scripts)
+        block.index = {e: i for i, e in enumerate(block.scripts)}
+        block.roots_idx = np.zeros((len(scripts),), dtype=int)
+        block.roots_idx[block.index[root]] = 1
+        block._inhibitions = {root: inhibitions}
+        block.tables = TableStructure(block.scripts, block.roots_idx)
+
+        contains = csr_matrix(RelationsGraph._compute_contains(block))
+        relations = dict(zip(['contains', 'opposed', 'associated', 'crossed', 'twin'],
+                             [contains] + RelationsGraph._compute_siblings(block)))
+        for i, m in enumerate(RelationsGraph._compute_table_rank(block, csr_matrix(contains.transpose()))):
+            relations['table_%d' % i] = m
+
+        result = dict(tables_sections(block))
+        for r in self.BLOCK_RELATIONS:
+            m = relations[r].tocoo()
+            result[r + '_row'] = m.row.astype(np.int32)
+            result[r + '_col'] = m.col.astype(np.int32)
+
+        self._write(name, lambda fp: np.savez(fp, **result))
+        return result
+
+    def prune(self) -> None:
+        """Remove the cache files that have not been used since the creation of the cache."""
+        for name in os.listdir(self.folder):
+            if name not in self._used and not name.endswith('.tmp'):
+                os.remove(os.path.join(self.folder, name))
+
+
+def read_dictionary_file(file: str) -> dict:
+    """
+    Read a dictionary yaml file.
+
+    :param file: the yaml file of a root paradigm
+    :return: the dict of the 'RootParadigm' entry, its 'inhibitions' and the lists of the 'Semes' and 'Paradigms'
+    entries. Each entry is a dict of its 'ieml', 'translations' and 'comments', stripped.
+    """
+    d = load_yaml(file)
+
+    def _entry(c):
+        return {'ieml': c['ieml'],
+                'translations': {lang: c['translations'][lang].strip() for lang in ('fr', 'en')},
+                'comments': {lang: v.strip() for lang, v in c.get('comments', {}).items() if lang in ('fr', 'en')}}
+
+    try:
+        return {'RootParadigm': _entry(d['RootParadigm']),
+                'inhibitions': d['RootParadigm']['inhibitions'],
+                'Semes': [_entry(c) for c in d['Semes']] if 'Semes' in d and d['Semes'] else [],
+                'Paradigms': [_entry(c) for c in d['Paradigms']] if 'Paradigms' in d and d['Paradigms'] else []}
+    except (KeyError, TypeError, AttributeError):
+        raise ValueError("'{}' is not a valid dictionary yaml file".format(file))
+
+
+def read_dictionary_files(files: List[str], workers: int = 1) -> List[dict]:
+    """
+    Read the dictionary yaml files.
+
+    :param files: the yaml files
+    :param workers: the number of worker processes, see map_files. If 1, the default, the files are read in the
+    current process.
+    :return: the content of each file in the order of files, see read_dictionary_file
+    """
+    return map_files(read_dictionary_file, files, workers=workers)
 
 
 def get_dictionary_files(folder:str=DICTIONARY_FOLDER):
@@ -95,23 +387,37 @@ def get_dictionary_files(folder:str=DICTIONARY_FOLDER):
 
 
 class Dictionary:
+    # the components of a dictionary, built on first access
+    COMPONENTS = ('translations', 'comments', 'tables', 'relations', 'search_index')
+
     @classmethod
-    def load(cls, folder:str=DICTIONARY_FOLDER, use_cache:bool=True, cache_folder:str=os.path.abspath('.')):
+    def load(cls, folder:str=DICTIONARY_FOLDER, use_cache:bool=True, cache_folder:str=os.path.abspath('.'),
+             workers:int=1, components=COMPONENTS):
         """
         Load a dictionary from a dictionary folder. The folder must contains a list of paradigms
         :param folder: The folder
         :param use_cache:
         :param cache_folder:
+        :param workers: the number of processes to read the yaml files, see read_dictionary_files
+        :param components: the components (see COMPONENTS) to build now if the cache can't be used, the others are
+        built on first access. The cache is only updated if all the components are built.
         :return:
         """
+        missing = set(components) - set(cls.COMPONENTS)
+        if missing:
+            raise ValueError("Unknown dictionary components : {%s}" % ", ".join(sorted(missing)))
+
+        start = time.perf_counter()
         print("Dictionary.load: Reading dictionary at {}".format(folder), file=sys.stderr)
 
         if use_cache:
             cache = FolderWatcherCache(folder, cache_folder=cache_folder)
-            if not cache.is_pruned():
-                print("Dictionary.load: Reading cache at {}".format(cache.cache_file), file=sys.stderr)
+            # the folder is scanned once to check and read the cache
+            cache_file = cache.cache_file
+            if not cache.is_pruned(cache_file):
+                print("Dictionary.load: Reading cache at {}".format(cache_file), file=sys.stderr)
 
-                return cache.get()
+                return cache.get(cache_file)
 
             print("Dictionary.load: Dictionary files changed  Recomputing cache.", file=sys.stderr)
 
@@ -119,59 +425,62 @@ class Dictionary:
         translations = {'fr': {}, 'en': {}}
         comments = {'fr': {}, 'en': {}}
 
-        def _add_metadatas(ieml, c):
-            translations['fr'][ieml] = c['translations']['fr'].strip()
-            translations['en'][ieml] = c['translations']['en'].strip()
-            if 'comments' in c:
-                if 'fr' in c['comments']: comments['fr'][ieml] = c['comments']['fr'].strip()
-                if 'en' in c['comments']: comments['en'][ieml] = c['comments']['en'].strip()
+        def _add_metadatas(c):
+            translations['fr'][c['ieml']] = c['translations']['fr']
+            translations['en'][c['ieml']] = c['translations']['en']
+            for lang, comment in c['comments'].items():
+                comments[lang][c['ieml']] = comment
 
         roots = []
         inhibitions = {}
 
-        n_ss = 0
-        n_p = 0
-        for f in get_dictionary_files(folder):
-            with open(f) as fp:
-                d = yaml.load(fp)
+        blocks = RootBlocksCache(cache_folder) if use_cache else None
 
-            try:
-                root = d['RootParadigm']['ieml']
-                inhibitions[root] = d['RootParadigm']['inhibitions']
+        files = get_dictionary_files(folder)
+        if blocks is not None:
+            contents = blocks.read_files(files, workers=workers)
+        else:
+            contents = read_dictionary_files(files, workers=workers)
 
-                roots.append(root)
-
-                _add_metadatas(root, d['RootParadigm'])
-                scripts.append(root)
-
-                if 'Semes' in d and d['Semes']:
-                    for c in d['Semes']:
-                        n_ss += 1
-                        scripts.append(c['ieml'])
-                        _add_metadatas(c['ieml'], c)
+        n_ss = 0
+        n_p = 0
+        for d in contents:
+            root = d['RootParadigm']['ieml']
+            inhibitions[root] = d['inhibitions']
 
-                if 'Paradigms' in d and d['Paradigms']:
-                    for c in d['Paradigms']:
-                        n_p += 1
-                        scripts.append(c['ieml'])
-                        _add_metadatas(c['ieml'], c)
+            roots.append(root)
+            for c in [d['RootParadigm']] + d['Semes'] + d['Paradigms']:
+                scripts.append(c['ieml'])
+                _add_metadatas(c)
 
-            except (KeyError, TypeError):
-                raise ValueError("'{}' is not a valid dictionary yaml file".format(f))
+            n_ss += len(d['Semes'])
+            n_p += len(d['Paradigms'])
 
-        print("Dictionary.load: Read {} root paradigms, {} paradigms and {} semes".format(len(roots), n_p, n_ss), file=sys.stderr)
+        print("Dictionary.load: Read {} root paradigms, {} paradigms and {} semes in {:.2f}s".format(
+            len(roots), n_p, n_ss, time.perf_counter() - start), file=sys.stderr)
+        start = time.perf_counter()
 
-        print("Dictionary.load: Computing table structure and relations ...", file=sys.stderr)
+        print("Dictionary.load: Computing {} ...".format(", ".join(components)), file=sys.stderr)
         dictionary = cls(scripts=scripts,
                          translations=translations,
                          root_paradigms=roots,
                          inhibitions=inhibitions,
-                         comments=comments)
-        print("Dictionary.load: Computing table structure and relations", file=sys.stderr)
+                         comments=comments,
+                         blocks=blocks)
+        for c in components:
+            getattr(dictionary, c)
 
-        if use_cache:
-            print("Dictionary.load: Updating cache at {}".format(cache.cache_file), file=sys.stderr)
-            cache.update(dictionary)
+        print("Dictionary.load: Parsed the scripts and computed {} in {:.2f}s".format(
+            ", ".join(components), time.perf_counter() - start), file=sys.stderr)
+
+        if use_cache and set(components) == set(cls.COMPONENTS):
+            print("Dictionary.load: Recomputed {} root paradigms".format(len(blocks.computed)), file=sys.stderr)
+            blocks.prune()
+
+            start = time.perf_counter()
+            cache_file = cache.update(dictionary)
+            print("Dictionary.load: Updated cache at {} in {:.2f}s".format(cache_file, time.perf_counter() - start),
+                  file=sys.stderr)
 
         return dictionary
 
@@ -180,29 +489,220 @@ class Dictionary:
                  root_paradigms: List[str],
                  translations: Dict[str, Dict[str, str]],
                  inhibitions: Dict[str, List[str]],
-                 comments: Dict[str, Dict[str, str]]):
-        
-        self.scripts = np.array(sorted(script(s) for s in scripts))
+                 comments: Dict[str, Dict[str, str]],
+                 blocks: RootBlocksCache = None):
+        """
+        The scripts are parsed, the other components (see COMPONENTS) are built on first access.
+
+        :param blocks: the cache to reuse the tables and relations of the unchanged root paradigms from, if given
+        """
+
+        self.scripts = np.array(sorted((script(s) for s in scripts), key=script_sort_key))
         self.index = {e: i for i, e in enumerate(self.scripts)}
 
         # list of root paradigms
         self.roots_idx = np.zeros((len(self.scripts),), dtype=int)
         self.roots_idx[[self.index[r] for r in root_paradigms]] = 1
 
-        # scripts to translations
-        self.translations = {s: Translations(fr=translations['fr'][s], en=translations['en'][s]) for s in self.scripts}
-
-        # scripts to translations
-        self.comments = {s: Comments(fr=comments['fr'][s] if s in comments['fr'] else '',
-                                     en=comments['en'][s] if s in comments['en'] else '') for s in self.scripts}
+        # the translations and comments read from the files, see the translations and comments properties
+        self._values = {'translations': translations, 'comments': comments}
 
         # map of root paradigm script -> inhibitions list values
         self._inhibitions = inhibitions
 
-        # self.tables = TableStructure
-        self.tables = TableStructure(self.scripts, self.roots_idx)
+        self._snapshot = None
+        self._blocks = blocks
+
+    @classmethod
+    def from_snapshot(cls, file: str) -> 'Dictionary':
+        """
+        Open a dictionary snapshot written by snapshot.write_snapshot. The file is memory mapped, the attributes of
+        the dictionary (scripts, translations, tables, relations...) are built from it on first access. The map is
+        released by close, or at the exit of a with block.
+
+        :param file: the snapshot file
+        :return: the dictionary
+        """
+        dictionary = cls.__new__(cls)
+        dictionary._snapshot = DictionarySnapshot(file)
+        dictionary._blocks = None
+        return dictionary
+
+    def close(self) -> None:
+        """
+        Release the memory map of the snapshot the dictionary was opened from, see DictionarySnapshot.close. The
+        attributes not built yet can't be built after. The map is also released when the dictionary is garbage
+        collected.
+        """
+        if self._snapshot is not None:
+            self._snapshot.close()
+
+    def __enter__(self) -> 'Dictionary':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    # attributes of the dictionaries opened from a snapshot, the other dictionaries set them in __init__
+
+    @locked_cached_property
+    def scripts(self):
+        return self._snapshot.scripts()
+
+    @locked_cached_property
+    def index(self):
+        return {e: i for i, e in enumerate(self.scripts)}
+
+    @locked_cached_property
+    def roots_idx(self):
+        return self._snapshot.roots_idx
+
+    @locked_cached_property
+    def _inhibitions(self):
+        return self._snapshot.inhibitions
+
+    @locked_cached_property
+    def _str_index(self):
+        """The dict script string -> index in scripts, read from the snapshot without building the scripts"""
+        if self._snapshot is not None:
+            strings = self._snapshot.strings('scripts_str')
+        else:
+            strings = [str(s) for s in self.scripts]
+
+        return {s: i for i, s in enumerate(strings)}
+
+    # the components of the dictionary, built on first access
+
+    @locked_cached_property
+    def translations(self):
+        """The dict script -> Translations"""
+        if self._snapshot is not None:
+            values = {lang: self._snapshot.strings('translations_' + lang) for lang in LANGUAGES}
+            return {s: Translations(**{lang: values[lang][i] for lang in LANGUAGES})
+                    for i, s in enumerate(self.scripts)}
 
-        self.relations = RelationsGraph(dictionary=self)
+        translations = self._values['translations']
+        return {s: Translations(fr=translations['fr'][s], en=translations['en'][s]) for s in self.scripts}
+
+    @locked_cached_property
+    def comments(self):
+        """The dict script -> Comments"""
+        if self._snapshot is not None:
+            values = {lang: self._snapshot.strings('comments_' + lang) for lang in LANGUAGES}
+            return {s: Comments(**{lang: values[lang][i] for lang in LANGUAGES}) for i, s in enumerate(self.scripts)}
+
+        comments = self._values['comments']
+        return {s: Comments(fr=comments['fr'][s] if s in comments['fr'] else '',
+                            en=comments['en'][s] if s in comments['en'] else '') for s in self.scripts}
+
+    @locked_cached_property
+    def tables(self):
+        """The TableStructure of the root paradigms"""
+        if self._snapshot is not None:
+            scripts, parents, regular = self._snapshot.tables()
+            return TableStructure.from_parents(self.scripts[scripts], parents.tolist(), regular.tolist())
+
+        if self._blocks is not None:
+            return self._blocks.tables(self)
+
+        return TableStructure(self.scripts, self.roots_idx)
+
+    @locked_cached_property
+    def relations(self):
+        """The RelationsGraph of the scripts"""
+        if self._snapshot is not None:
+            return RelationsGraph.from_matrices(self, {r: self._snapshot.relation(r) for r in RELATIONS})
+
+        if self._blocks is not None:
+            return self._blocks.relations(self)
+
+        return RelationsGraph(dictionary=self)
+
+    @locked_cached_property
+    def search_index(self):
+        """The SearchIndex of the translations and comments"""
+        if self._snapshot is not None:
+            return SearchIndex.from_snapshot(self._snapshot)
+
+        return SearchIndex.build(self)
+
+    def search(self, query: str, lang: str = 'en', limit: int = 10, fuzzy: bool = False) -> List[int]:
+        """
+        Search the scripts by the words of their translations and comments. The accents and the case are ignored,
+        the query words match the words they are equal to or a prefix of.
+
+        :param query: the words to search
+        :param lang: the language of the translations and comments
+        :param limit: the maximum number of results
+        :param fuzzy: if True, the query words also match the words with similar trigrams
+        :return: the indices in scripts of the best matching scripts, best first
+        """
+        return self.search_index.search(query, lang, limit=limit, fuzzy=fuzzy)
+
+    # the primitives in the order of their bit in the canonical bytes
+    FEATURES_PRIMITIVES = sorted(character_value, key=character_value.get)
+
+    def feature_matrix(self) -> np.ndarray:
+        """
+        Return the scripts as integer features, an array of shape (len(self), n_features) with one row per script,
+        in the order of self.scripts. The columns are (see feature_names) :
+         - the layer, the cardinal and the grammatical class of the script,
+         - for each primitive, the number of positions that contain it,
+         - for each position (3 ** layer positions, a multiplication concatenates the positions of its children and
+           an addition unites them), one bit per primitive. The positions are padded with zeros to 3 ** max layer.
+
+        The matrix is computed from the canonical bytes of the layer 0 scripts on the first call, and kept in memory
+        by this Dictionary instance. It is not stored in the cache snapshot.
+        :return: the int16 features matrix
+        """
+        return self._features
+
+    @locked_cached_property
+    def _features(self) -> np.ndarray:
+        n_positions = self._n_positions()
+        positions = {}
+
+        def _positions(s):
+            # the positions of a multiplication are the concatenation of the 3 ** (layer - 1) positions of its
+            # children, the positions of an addition are the union of the positions of its children
+            if s not in positions:
+                if s.layer == 0 and not isinstance(s, AdditiveScript) or s.empty:
+                    positions[s] = s.canonical
+                elif isinstance(s, AdditiveScript):
+                    value = 0
+                    for c in s.children:
+                        value |= int.from_bytes(_positions(c), 'big')
+                    positions[s] = value.to_bytes(3 ** s.layer, 'big')
+                else:
+                    positions[s] = b''.join(_positions(c) for c in s.children)
+
+            return positions[s]
+
+        canonical = np.frombuffer(b''.join(_positions(s).ljust(n_positions, b'\0') for s in self.scripts),
+                                  dtype=np.uint8).reshape((len(self), n_positions))
+
+        # bits[i, p, k] : the position p of script i contains the primitive k
+        bits = (canonical[:, :, np.newaxis] >> np.arange(len(self.FEATURES_PRIMITIVES), dtype=np.uint8)) & 1
+
+        attributes = np.array([[s.layer, s.cardinal, s.script_class] for s in self.scripts], dtype=np.int16)
+
+        return np.hstack([attributes,
+                          bits.sum(axis=1, dtype=np.int16),
+                          bits.reshape((len(self), -1)).astype(np.int16)])
+
+    def _n_positions(self) -> int:
+        """The number of positions of the features, the positions of the scripts of the highest layer"""
+        return 3 ** max(s.layer for s in self.scripts)
+
+    def feature_names(self) -> List[str]:
+        """
+        :return: the names of the columns of feature_matrix
+        """
+        n_positions = self._n_positions()
+
+        return ['layer', 'cardinal', 'class'] + \
+               ['count_{}'.format(p) for p in self.FEATURES_PRIMITIVES] + \
+               ['{}_{}'.format(i, p) for i in range(n_positions) for p in self.FEATURES_PRIMITIVES]
 
     def __len__(self):
         return self.scripts.__len__()
@@ -210,10 +710,38 @@ class Dictionary:
     # def one_hot(self, s):
     #     return np.eye(len(self), dtype=int)[self.index[s]]
 
+    def get_index(self, item) -> int:
+        """
+        The strings of the dictionary scripts are found with a dict lookup, the other strings are parsed.
+
+        :param item: a script or a script string
+        :return: the index of the script in scripts
+        :raise KeyError: if the script is not in the dictionary
+        """
+        if isinstance(item, str):
+            index = self._str_index.get(item)
+            if index is not None:
+                return index
+        elif item in self.index:
+            return self.index[item]
+
+        return self.index[script(item)]
+
+    def get_many(self, items) -> np.ndarray:
+        """
+        :param items: a list of scripts or script strings
+        :return: the array of the scripts of the dictionary, in the order of items
+        :raise KeyError: if a script is not in the dictionary
+        """
+        return self.scripts[[self.get_index(item) for item in items]]
+
     def __getitem__(self, item):
-        return self.scripts[self.index[script(item)]]
+        return self.scripts[self.get_index(item)]
 
     def __contains__(self, item):
+        if isinstance(item, str):
+            return item in self._str_index
+
         return item in self.index
 
 
@@ -3,7 +3,6 @@ from itertools import groupby, combinations, permutations, chain, repeat
 
 import numpy as np
 import sys
-import pandas
 
 from scipy.sparse.coo import coo_matrix
 from scipy.sparse.csr import csr_matrix
@@ -79,6 +78,19 @@ class RelationsGraph:
         self.scripts = dictionary.scripts
         self.index = dictionary.index
 
+    @classmethod
+    def from_matrices(cls, dictionary, relations):
+        """
+        :param dictionary: the dictionary of the relations
+        :param relations: the dict relation name -> csr_matrix of all the RELATIONS
+        :return: the relations graph of the already computed matrices
+        """
+        graph = cls.__new__(cls)
+        graph.relations = relations
+        graph.scripts = dictionary.scripts
+        graph.index = dictionary.index
+        return graph
+
     def object(self, subject, relation):
         return self.scripts[sorted(self.relations[relation][self.index[subject]].indices)]
 
@@ -86,6 +98,8 @@ class RelationsGraph:
         return {relation: self.object(subject, relation) for relation in RELATIONS}
 
     def pandas(self):
+        import pandas
+
         subjects = []
         relations = []
         objects = []
@@ -202,10 +216,11 @@ class RelationsGraph:
 
         for r_p, v in dictionary.tables.roots.items():
             paradigms = {t for t in v if t.script.paradigm}
+            masks = {t: t.script.ss_mask(r_p) for t in paradigms}
 
             for p in paradigms:
                 _contains = [dictionary.index[ss] for ss in p.script.singular_sequences] + \
-                            [dictionary.index[k.script] for k in paradigms if k.script in p.script]
+                            [dictionary.index[k.script] for k in paradigms if masks[k] & ~masks[p] == 0]
                 i.extend(repeat(dictionary.index[p.script], len(_contains)))
                 j.extend(_contains)
 
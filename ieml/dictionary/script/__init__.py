@@ -1,4 +1,4 @@
-from .script import Script, AdditiveScript, MultiplicativeScript, NullScript
+from .script import Script, AdditiveScript, MultiplicativeScript, NullScript, script_sort_key, from_bytes
 from .tools import factorize
 from .operator import script, m
 from .parser import ScriptParser
\ No newline at end of file
@@ -0,0 +1,232 @@
+import re
+from collections import namedtuple
+
+from ieml.dictionary.script import AdditiveScript, MultiplicativeScript, NullScript
+from ieml.constants import LAYER_MARKS
+from ieml.exceptions import InvalidScript, TooManySingularSequences
+
+
+# Hand-written recursive descent parser of the script grammar (see ScriptParser for the reference PLY grammar). It
+# builds the same scripts with the same constructors, without the LALR tables and without a lock.
+
+PRIMITIVE, REMARKABLE_ADDITION, REMARKABLE_MULTIPLICATION, LAYER_MARK, PLUS = range(5)
+
+# same tokens as the lexer, the groups are numbered as the token types
+_TOKEN = re.compile(r"[ \t\n]*(?:([EUASBT])|([OMFI])|(wo|wa|wu|we|[yoeuaijgsbthckmnpxdfl])|([:.\-'’,_;])|(\+))")
+
+_LAYER_OF_MARK = dict({m: i for i, m in enumerate(LAYER_MARKS)}, **{'’': 3})
+
+
+# the scripts of the characters tokens (primitives, remarkable additions and multiplications), built on first use
+_CHARACTERS_SCRIPTS = {}
+
+
+def _character_script(kind, value):
+    if value not in _CHARACTERS_SCRIPTS:
+        if kind == PRIMITIVE:
+            _CHARACTERS_SCRIPTS[value] = NullScript(layer=0) if value == 'E' else MultiplicativeScript(character=value)
+        elif kind == REMARKABLE_ADDITION:
+            _CHARACTERS_SCRIPTS[value] = AdditiveScript(character=value)
+        else:
+            _CHARACTERS_SCRIPTS[value] = MultiplicativeScript(character=value)
+
+    return _CHARACTERS_SCRIPTS[value]
+
+
+class ScriptSyntaxError(Exception):
+    """The string is not recognized by the descent parser, the reference parser reports the error."""
+    def __init__(self, msg, position=None):
+        super().__init__(msg)
+        # the position of the error in the string, if known
+        self.position = position
+
+
+# an error found by validate, the position is the index of the character in the string
+ScriptError = namedtuple('ScriptError', ['string', 'position', 'message'])
+
+
+def tokenize(s, positions=None, errors=None):
+    """
+    :param s: the script string
+    :param positions: if a list is given, the position in s of each token is appended to it
+    :param errors: if a list is given, the illegal characters are skipped (as the lexer does) and appended to it as
+    (position, message), else a ScriptSyntaxError is raised
+    :return: the list of the (token type, value) of s, the value of a layer mark is its layer
+    """
+    tokens = []
+    position = 0
+    end = len(s.rstrip(' \t\n'))
+
+    while position < end:
+        match = _TOKEN.match(s, position)
+        if match is None:
+            # the blanks before the illegal character
+            position += len(s[position:]) - len(s[position:].lstrip(' \t\n'))
+            message = "Illegal character '%s'" % s[position]
+            if errors is None:
+                raise ScriptSyntaxError(message, position)
+
+            errors.append((position, message))
+            position += 1
+            continue
+
+        kind = match.lastindex - 1
+        value = match.group(match.lastindex)
+        tokens.append((kind, _LAYER_OF_MARK[value] if kind == LAYER_MARK else value))
+        if positions is not None:
+            positions.append(match.start(match.lastindex))
+        position = match.end()
+
+    return tokens
+
+
+class DescentParser:
+    def __init__(self, tokens, positions=None, end=None):
+        """
+        :param tokens: the tokens of the string
+        :param positions: the positions of the tokens in the string, to locate the errors
+        :param end: the length of the string, the position of the errors at EOF
+        """
+        self.tokens = tokens
+        self.positions = positions
+        self.end = end
+        self.position = 0
+
+    def parse(self):
+        """
+        term : sum_lvl_n, the layer n of the term is given by its last mark
+        """
+        if not self.tokens or self.tokens[-1][0] != LAYER_MARK:
+            raise self._error("Syntax error at EOF", len(self.tokens))
+
+        result = self.sum(self.tokens[-1][1])
+
+        if self.position != len(self.tokens):
+            raise self._error("Syntax error at '%s'" % str(self.tokens[self.position][1]))
+
+        return result
+
+    def _error(self, msg, index=None):
+        """The syntax error at the token index, the current token by default."""
+        if index is None:
+            index = self.position
+
+        position = None
+        if self.positions is not None:
+            position = self.positions[index] if index < len(self.positions) else self.end
+
+        return ScriptSyntaxError(msg, position)
+
+    def _locate(self, error, start):
+        """Give the position of the token start to an invalid script error, if it has none."""
+        if self.positions is not None and getattr(error, 'position', None) is None:
+            error.position = self.positions[start]
+        return error
+
+    def _next(self):
+        if self.position == len(self.tokens):
+            raise self._error("Syntax error at EOF")
+
+        token = self.tokens[self.position]
+        self.position += 1
+        return token
+
+    def _at_mark(self, layer):
+        return self.position < len(self.tokens) and self.tokens[self.position] == (LAYER_MARK, layer)
+
+    def _mark(self, layer):
+        if self._next() != (LAYER_MARK, layer):
+            raise self._error("Expected the layer %d mark" % layer, self.position - 1)
+
+    def sum(self, layer):
+        """
+        sum_lvl_n : script_lvl_n
+                  | script_lvl_n PLUS sum_lvl_n
+        """
+        start = self.position
+        children = [self.script(layer)]
+        while self.position < len(self.tokens) and self.tokens[self.position][0] == PLUS:
+            self.position += 1
+            children.append(self.script(layer))
+
+        if len(children) == 1:
+            return children[0]
+
+        try:
+            return AdditiveScript(children=children)
+        except (InvalidScript, TooManySingularSequences) as e:
+            raise self._locate(e, start)
+
+    def script(self, layer):
+        """
+        script_lvl_0 : PRIMITIVE LAYER0_MARK
+                     | REMARKABLE_ADDITION LAYER0_MARK
+        script_lvl_1 : REMARKABLE_MULTIPLICATION LAYER1_MARK
+        script_lvl_n : sum_lvl_n-1 LAYERn_MARK
+                     | sum_lvl_n-1 sum_lvl_n-1 LAYERn_MARK
+                     | sum_lvl_n-1 sum_lvl_n-1 sum_lvl_n-1 LAYERn_MARK
+        """
+        if layer == 0:
+            kind, value = self._next()
+            if kind != PRIMITIVE and kind != REMARKABLE_ADDITION:
+                raise self._error("Syntax error at '%s'" % str(value), self.position - 1)
+
+            result = _character_script(kind, value)
+
+            self._mark(0)
+            return result
+
+        if layer == 1 and self.position < len(self.tokens) and \
+                self.tokens[self.position][0] == REMARKABLE_MULTIPLICATION:
+            kind, value = self._next()
+            self._mark(1)
+            return _character_script(kind, value)
+
+        start = self.position
+        children = [self.sum(layer - 1)]
+        while len(children) < 3 and not self._at_mark(layer):
+            children.append(self.sum(layer - 1))
+
+        self._mark(layer)
+        try:
+            return MultiplicativeScript(children=children)
+        except (InvalidScript, TooManySingularSequences) as e:
+            raise self._locate(e, start)
+
+
+def parse(s):
+    """
+    Parse a script string with the descent parser.
+
+    :param s: the script string
+    :return: the script
+    :raise ScriptSyntaxError: if s is not recognized
+    :raise InvalidScript: if the script is invalid
+    """
+    return DescentParser(tokenize(s)).parse()
+
+
+def validate(strings):
+    """
+    Check a batch of script strings in one pass. Each string is tokenized once, the illegal characters are reported
+    and skipped, then the tokens are parsed.
+
+    :param strings: the script strings
+    :return: the list of the ScriptError of all the strings, every illegal character and the first syntax or script
+    error of each string
+    """
+    result = []
+    for s in strings:
+        positions = []
+        errors = []
+        tokens = tokenize(s, positions=positions, errors=errors)
+        result.extend(ScriptError(s, position, message) for position, message in errors)
+
+        try:
+            DescentParser(tokens, positions=positions, end=len(s)).parse()
+        except ScriptSyntaxError as e:
+            result.append(ScriptError(s, e.position, str(e)))
+        except (InvalidScript, TooManySingularSequences) as e:
+            result.append(ScriptError(s, getattr(e, 'position', 0), str(e)))
+
+    return result
@@ -1,42 +1,62 @@
 import logging
 import types
-from functools import lru_cache
-import os
 import ply.yacc as yacc
 
 from ieml.exceptions import InvalidScript, CannotParse
-from ieml.dictionary.script import AdditiveScript, MultiplicativeScript, NullScript
+from ieml.dictionary.script import Script, AdditiveScript, MultiplicativeScript, NullScript
 from ieml.constants import REMARKABLE_ADDITION
-from ieml.commons import Singleton
+from ieml.commons import Singleton, LRUCache, ThreadLocalParser
 from ieml.dictionary.script.parser.lexer import get_script_lexer, tokens
-
-from ieml import PARSER_FOLDER
-import threading
+from ieml.dictionary.script.parser import descent
 
 
 class ScriptParser(metaclass=Singleton):
     tokens = tokens
-
-    # ply have an internal state , then we forbid two thread try to parse a string simultaneously
-    lock = threading.Lock()
+    start = 'term'
+    tabmodule = 'ieml.dictionary.script.parser.parsetab'
 
     def __init__(self):
         self.t_add_rules()
 
         self.lexer = get_script_lexer()
-        self.parser = yacc.yacc(module=self, errorlog=logging, start='term',
-                                debug=False, optimize=True,
-                                picklefile=os.path.join(PARSER_FOLDER, "script_parser.pickle"))
-        # rename the parsing method (can't name it directly parse with lru_cache due to ply checking)
-        self.parse = self.t_parse
-
-    @lru_cache(maxsize=10000)
-    def t_parse(self, s):
-        with self.lock:
-            try:
-                return self.parser.parse(s, lexer=self.lexer)
-            except InvalidScript as e:
-                raise CannotParse(s, str(e))
+        # the tables are read from the tabmodule generated by scripts/generate_parser_tables.py, they are built in
+        # memory if it is missing, and never written at runtime
+        self.parser = yacc.yacc(module=self, errorlog=logging, start=self.start, tabmodule=self.tabmodule,
+                                debug=False, optimize=True, write_tables=False)
+
+        self._thread_parser = ThreadLocalParser(self.parser, self.lexer)
+        self.cache = LRUCache(maxsize=10000)
+
+    def parse(self, s):
+        return self.cache.get(s, self._parse)
+
+    def _parse(self, s):
+        # the descent parser is the fast path, the strings it does not recognize are given to the PLY parser to get
+        # the same result or error.
+        try:
+            return descent.parse(s)
+        except descent.ScriptSyntaxError:
+            pass
+        except InvalidScript as e:
+            raise CannotParse(s, str(e))
+
+        return self.parse_reference(s)
+
+    def validate(self, strings):
+        """
+        Check a batch of strings in one pass, without stopping at the first error.
+
+        :param strings: the script strings
+        :return: the list of the descent.ScriptError (string, position, message) of every error found
+        """
+        return descent.validate(strings)
+
+    def parse_reference(self, s):
+        """Parse s with the PLY parser, the reference implementation of the grammar."""
+        try:
+            return self._thread_parser.parse(s)
+        except InvalidScript as e:
+            raise CannotParse(s, str(e))
 
     def p_error(self, p):
         if p:
@@ -93,7 +113,8 @@ class ScriptParser(metaclass=Singleton):
                         | additive_script_lvl_0 additive_script_lvl_0 LAYER1_MARK
                         | additive_script_lvl_0 additive_script_lvl_0 additive_script_lvl_0 LAYER1_MARK
                         | REMARKABLE_MULTIPLICATION LAYER1_MARK"""
-        if isinstance(p[1], AdditiveScript):
+        # additive_script_lvl_0 is a Script, an addition of a single script being the script itself (see ScriptType)
+        if isinstance(p[1], Script):
             if len(p) == 3:
                 p[0] = MultiplicativeScript(substance=p[1])
             elif len(p) == 4:
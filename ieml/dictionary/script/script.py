@@ -1,14 +1,83 @@
+import heapq
 import itertools
+import threading
+import weakref
+from operator import attrgetter
+
 import numpy as np
 
 from ieml.exceptions import InvalidScriptCharacter, InvalidScript, IncompatiblesScriptsLayers, TooManySingularSequences
-from ieml.commons import TreeStructure
+from ieml.commons import TreeStructure, cached_property
 from ieml.constants import MAX_LAYER, MAX_SINGULAR_SEQUENCES, MAX_SIZE_HEADER, LAYER_MARKS, PRIMITIVES, \
     remarkable_multiplication_lookup_table, REMARKABLE_ADDITION, character_value, AUXILIARY_CLASS, VERB_CLASS, \
     NOUN_CLASS
 
 
-class Script(TreeStructure):
+# Intern table of all the living scripts, indexed by their IEML string. The string of a script is its canonical
+# definition, so two scripts with the same string are the same object.
+_SCRIPTS_TABLE = weakref.WeakValueDictionary()
+_SCRIPTS_TABLE_LOCK = threading.Lock()
+
+
+def _intern(script):
+    with _SCRIPTS_TABLE_LOCK:
+        return _SCRIPTS_TABLE.setdefault(script._str, script)
+
+
+def _unpickle_script(cls, s):
+    """Return the interned script for the string s, or an empty instance to be filled by __setstate__"""
+    with _SCRIPTS_TABLE_LOCK:
+        instance = _SCRIPTS_TABLE.get(s)
+        if instance is None:
+            instance = object.__new__(cls)
+            # the hash is needed before the state is restored
+            instance._str = s
+            _SCRIPTS_TABLE[s] = instance
+
+    return instance
+
+
+# key function of the scripts order, sort the scripts without calling Script.__lt__
+script_sort_key = attrgetter('sort_key')
+
+
+def _bits(mask):
+    """Iterate over the positions of the bits set in mask"""
+    i = 0
+    while mask:
+        if mask & 1:
+            yield i
+        mask >>= 1
+        i += 1
+
+
+# Binary encoding of the scripts (Script.to_bytes / from_bytes), one byte per node in prefix order :
+#  - 0b00xxxxxx : a layer 0 script, the 6 bits are the union of the primitives character_value,
+#  - 0b01000lll : the null script of layer lll (lll > 0),
+#  - 0b10000000 : a multiplication of layer > 1, followed by its 3 children,
+#  - 0b10xxxxxx : a multiplication of layer 1, xxxxxx is the substance code, followed by the attribute and the mode,
+#  - 0b11nnnnnn : an addition of nnnnnn children, followed by the children. If nnnnnn is 0, the number of children is
+#    in the next 2 bytes (big endian).
+_BYTES_NULL = 0b01000000
+_BYTES_MULTIPLICATION = 0b10000000
+_BYTES_ADDITION = 0b11000000
+_BYTES_KIND_MASK = 0b11000000
+_BYTES_VALUE_MASK = 0b00111111
+
+
+class ScriptType(type):
+    """This metaclass hash-conses the scripts : building a script that already exists returns the existing
+    instance instead of the newly built one. An addition of a single script is this script : AdditiveScript(
+    children=[x]) returns x, whatever the class of x."""
+    def __call__(cls, *args, **kwargs):
+        script = super().__call__(*args, **kwargs)
+        if isinstance(script, AdditiveScript) and len(script.children) == 1:
+            return script.children[0]
+
+        return _intern(script)
+
+
+class Script(TreeStructure, metaclass=ScriptType):
     """ A parser is defined by a character (PRIMITIVES, REMARKABLE_ADDITION OR REMARKABLE_MULTIPLICATION)
      or a list of parser children. All the element in the children list must be an AdditiveScript or
      a MultiplicativeScript."""
@@ -41,32 +110,55 @@ class Script(TreeStructure):
         self._singular_sequences = None
         self._singular_sequences_set = None
 
+        # The position of each singular sequence in the ordered list
+        self._singular_sequences_index = None
+        # The positions in the ordered list of the singular sequences of each child of an addition
+        self._children_positions = None
+        # The singular sequences bitmasks, indexed by the script that defines the numbering
+        self._ss_masks = None
+
         # The contained paradigms (tables)
         self._tables = None
-        self._cells = None
+        # The cells of each table as arrays of indices in the singular sequences list
+        self._cells_index = None
         self._tables_script = None
 
         # The canonical string to compare same layer and cardinal parser (__lt__)
         self.canonical = None
 
+        # The key of the scripts total order (__lt__), computed at construction. The scripts are ordered :
+        #  - by layer,
+        #  - the null script is the lowest of its layer,
+        #  - by cardinal (number of singular sequences),
+        #  - by canonical bytes,
+        #  - a multiplicative script is lower than an additive one,
+        #  - by children keys, in alphabetical order.
+        self.sort_key = None
+
         # class of the parser, one of the following : VERB (1), AUXILIARY (0), and NOUN (2)
         self.script_class = None
 
-    # def __new__(cls, *args, **kwargs):
-    #     """
-    #     Need this to pickle scripts, the pickler use __hash__ method before unpickling the
-    #     object attribute. Then need to pass the _str.
-    #     """
-    #     instance = super(Script, cls).__new__(cls)
-    #     if 'str' in kwargs:
-    #         instance._str = kwargs['str']
-    #
-    #     return instance
-    #
-    # def __getnewargs_ex__(self):
-    #     return ((), {
-    #         'str': str(self)
-    #     })
+    def to_bytes(self):
+        """Return the compact binary encoding of this script, to decode with from_bytes."""
+        buffer = bytearray()
+        self._encode(buffer)
+        return bytes(buffer)
+
+    def _encode(self, buffer):
+        # a layer 0 script is defined by its primitives
+        buffer.append(self.canonical[0])
+
+    def __reduce__(self):
+        """
+        Need this to pickle scripts, the pickler use __hash__ method before unpickling the
+        object attribute, and the unpickled scripts have to be interned. Then need to pass the _str.
+        """
+        return _unpickle_script, (self.__class__, self._str), self.__dict__
+
+    def __setstate__(self, state):
+        # an already interned script is kept as is
+        if 'layer' not in self.__dict__:
+            self.__dict__.update(state)
 
     def __add__(self, other):
         if not isinstance(other, Script):
@@ -74,9 +166,36 @@ class Script(TreeStructure):
 
         return AdditiveScript(children=[self, other])
 
+    def __or__(self, other):
+        """The factorized script of the union of the singular sequences of the two scripts."""
+        if not isinstance(other, Script):
+            return NotImplemented
+
+        from ieml.dictionary.script.tools import union
+        return union(self, other)
+
+    def __and__(self, other):
+        """The factorized script of the intersection of the singular sequences of the two scripts, None if they are
+        disjoint."""
+        if not isinstance(other, Script):
+            return NotImplemented
+
+        from ieml.dictionary.script.tools import intersection
+        return intersection(self, other)
+
+    def __sub__(self, other):
+        """The factorized script of the singular sequences of this script that are not in other, None if there is
+        none."""
+        if not isinstance(other, Script):
+            return NotImplemented
+
+        from ieml.dictionary.script.tools import difference
+        return difference(self, other)
+
     def __eq__(self, other):
         if isinstance(other, Script):
-            return self.__hash__() == other.__hash__()
+            # the scripts are interned, two equal scripts are the same instance
+            return self is other
         else:
             return super().__eq__(other)
 
@@ -88,63 +207,7 @@ class Script(TreeStructure):
         if not isinstance(self, Script) or not isinstance(other, Script):
             return NotImplemented
 
-        if self == other:
-            return False
-
-        if self.layer != other.layer:
-            # order by layer
-            return self.layer < other.layer
-        else:
-            # Cardinal of 1 the minimum, null_script is minimum
-            if isinstance(self, NullScript):
-                return True
-
-            if isinstance(other, NullScript):
-                return False
-
-            if self.cardinal != other.cardinal:
-                # then by number of singular sequence
-                return self.cardinal < other.cardinal
-            else:
-                # Compare the canonical form
-                if self.canonical != other.canonical:
-                    return self.canonical < other.canonical
-                elif self.layer != 0:
-                    # layer != 0 => children is set, no children are for layer 0 (MultiplicativeScript)
-                    if isinstance(self, other.__class__):
-                        # if they are the same class
-                        # Compare the children in alphabetical order
-                        iterator = iter(other.children)
-                        for s in self.children:
-                            try:
-                                o = iterator.__next__()
-                                if o != s:
-                                    return s < o
-                            except StopIteration:
-                                return False
-                        # self have fewer elements, all equals to the first of other's children, self is lower.
-                        return True
-                    else:
-                        # not an instance, one is multiplicative, other one is additive
-                        # They have the same number of singular sequence so the multiplicative is fewer :
-                        # each variable of the addition have less singular sequence than the multiplication parser
-                        return isinstance(self, MultiplicativeScript)
-                else:
-                    # Layer 0
-                    # Compare the value of the character or the sum
-                    if isinstance(self, AdditiveScript):
-                        # The character value is the sum of all character of the addition
-                        self_char_value = sum((character_value[c.character] for c in self.children))
-                    else:
-                        self_char_value = character_value[self.character]
-
-                    if isinstance(other, AdditiveScript):
-                        # The character value is the sum of all character of the addition
-                        other_char_value = sum((character_value[c.character] for c in other.children))
-                    else:
-                        other_char_value = character_value[other.character]
-
-                    return self_char_value < other_char_value
+        return self.sort_key < other.sort_key
 
     # def __getitem__(self, index):
     #     return self.children[index]
@@ -163,17 +226,40 @@ class Script(TreeStructure):
 
     def _build_tables(self):
         if self.cardinal == 1:
-            self._cells = (np.array([[[self]]]),)
+            self._cells_index = (np.zeros((1, 1, 1), dtype=int),)
             self._tables_script = (self,)
         else:
-            _cells, _tables_script = self._compute_cells()
-            self._cells, self._tables_script = tuple(_cells), tuple(_tables_script)
+            _cells_index, _tables_script = self._compute_cells()
+            self._cells_index, self._tables_script = tuple(_cells_index), tuple(_tables_script)
 
     @property
-    def cells(self):
-        if self._cells is None:
+    def cells_index(self):
+        """The cells of the tables of this script, as 3 dimensions int arrays of positions in singular_sequences."""
+        if self._cells_index is None:
             self._build_tables()
-        return self._cells
+        return self._cells_index
+
+    @property
+    def cells(self):
+        """The cells of the tables of this script, as 3 dimensions object arrays of singular sequences. The arrays
+        are resolved from cells_index at each access."""
+        return tuple(self.resolve_cells(c) for c in self.cells_index)
+
+    @cached_property
+    def singular_sequences_array(self):
+        """The singular sequences as a 1 dimension object array, to index with the int arrays of positions."""
+        singular_sequences = np.empty(self.cardinal, dtype=object)
+        for i, s in enumerate(self.singular_sequences):
+            singular_sequences[i] = s
+
+        return singular_sequences
+
+    def resolve_cells(self, index):
+        """Return an object array of the singular sequences at the positions of the int array index."""
+        if np.ndim(index) == 0:
+            return self.singular_sequences[index]
+
+        return self.singular_sequences_array[index]
 
     @property
     def tables_script(self):
@@ -196,11 +282,156 @@ class Script(TreeStructure):
 
         return self._singular_sequences_set
 
+    @property
+    def singular_sequences_index(self):
+        """The dense numbering of the singular sequences: map each singular sequence to its position in
+        singular_sequences."""
+        if self._singular_sequences_index is None:
+            self._singular_sequences_index = {s: i for i, s in enumerate(self.singular_sequences)}
+
+        return self._singular_sequences_index
+
+    def ss_mask(self, root=None):
+        """
+        Return the singular sequences of this script as a bitmask over the numbering of the singular sequences
+        of root : the bit i is set if root.singular_sequences[i] is a singular sequence of this script.
+        The containment, the intersection and the union of the scripts of a same root are then integer operations.
+
+        :param root: the script that defines the numbering, this script if None
+        :return: the bitmask as an int
+        """
+        if root is None:
+            root = self
+
+        if self._ss_masks is None:
+            self._ss_masks = {}
+
+        if root not in self._ss_masks:
+            mask = self.common_mask(root) if root.layer == self.layer else 0
+            if bin(mask).count('1') != self.cardinal:
+                raise ValueError("The script %s is not contained in %s." % (str(self), str(root)))
+
+            self._ss_masks[root] = mask
+
+        return self._ss_masks[root]
+
+    def common_mask(self, root):
+        """
+        Return the singular sequences of root that are also singular sequences of this script, as a bitmask over
+        the numbering of the singular sequences of root. Unless both singular sequences lists are already built, it is
+        computed from the masks of the children, without enumerating the singular sequences. The script does not have
+        to be contained in root.
+
+        :param root: the script that defines the numbering, of the same layer
+        :return: the bitmask as an int
+        """
+        if self is root:
+            return (1 << root.cardinal) - 1
+
+        if self._singular_sequences is not None and root._singular_sequences_index is not None:
+            # both numberings are already built, a lookup per singular sequence is cheaper than the recursion
+            index = root._singular_sequences_index
+            mask = 0
+            for ss in self._singular_sequences:
+                if ss in index:
+                    mask |= 1 << index[ss]
+            return mask
+
+        if self.layer == 0:
+            # the canonical byte of a layer 0 script is the union of its primitives
+            return sum(1 << i for i, ss in enumerate(root.singular_sequences) if ss.canonical[0] & self.canonical[0])
+
+        if isinstance(self, AdditiveScript) and self.paradigm:
+            mask = 0
+            for child in self.children:
+                mask |= child.common_mask(root)
+            return mask
+
+        if not root.paradigm:
+            return 1 if self._has_singular_sequence(root) else 0
+
+        if isinstance(root, AdditiveScript):
+            mask = 0
+            for child, positions in zip(root.children, root.children_positions):
+                for i in _bits(self.common_mask(child)):
+                    mask |= 1 << positions[i]
+            return mask
+
+        # the positions in a multiplication are written in the mixed radix of the children cardinals
+        mask = 1
+        for child, root_child in zip(self.children, root.children):
+            child_mask = child.common_mask(root_child)
+            if not child_mask:
+                return 0
+
+            mask = sum(child_mask << (i * root_child.cardinal) for i in _bits(mask))
+
+        return mask
+
     def _compute_cells(self):
         pass
 
+    def iter_singular_sequences(self):
+        """Iterate over the singular sequences in order, they are generated lazily if the list is not computed."""
+        if self._singular_sequences is not None:
+            return iter(self._singular_sequences)
+
+        return self._iter_singular_sequences()
+
+    def nth_singular_sequence(self, i):
+        """
+        Return the singular sequence at the position i of singular_sequences. It is computed from the children
+        singular sequences, without building the singular sequences list.
+
+        :param i: the position of the singular sequence
+        :return: the singular sequence
+        """
+        if i < 0:
+            i += self.cardinal
+
+        if not 0 <= i < self.cardinal:
+            raise IndexError("Singular sequence index %d out of range for %s." % (i, str(self)))
+
+        if self._singular_sequences is not None:
+            return self._singular_sequences[i]
+
+        return self._nth_singular_sequence(i)
+
+    def index_of_singular_sequence(self, ss):
+        """
+        Return the position of ss in singular_sequences. It is computed from the children singular sequences,
+        without building the singular sequences list.
+
+        :param ss: the singular sequence
+        :return: its position
+        """
+        if not isinstance(ss, Script) or ss.cardinal != 1 or ss.layer != self.layer or \
+                not self._has_singular_sequence(ss):
+            raise ValueError("%s is not a singular sequence of %s." % (str(ss), str(self)))
+
+        if self._singular_sequences_index is not None:
+            return self._singular_sequences_index[ss]
+
+        return self._count_lower(ss)
+
     def _compute_singular_sequences(self):
-        pass
+        return list(self._iter_singular_sequences())
+
+    # The following methods are for a singular script, and are overridden by the paradigms.
+
+    def _iter_singular_sequences(self):
+        yield self
+
+    def _nth_singular_sequence(self, i):
+        return self
+
+    def _count_lower(self, ss):
+        """Return the number of singular sequences of this script lower than ss, a singular sequence of the same
+        layer"""
+        return 1 if self.sort_key < ss.sort_key else 0
+
+    def _has_singular_sequence(self, ss):
+        return self is ss
 
 
 class AdditiveScript(Script):
@@ -251,6 +482,47 @@ class AdditiveScript(Script):
 
         super().__init__(children=_children, character=_character)
 
+        self._compute_attributes()
+
+        if self.cardinal > MAX_SINGULAR_SEQUENCES:
+            raise TooManySingularSequences(self.cardinal)
+
+        self.__order()
+        self._do_precompute_str()
+
+    @classmethod
+    def _from_trusted(cls, children):
+        """
+        Build the addition of canonical children, without the validation and the canonicalization of the
+        constructor. The caller guarantees that the children are at least two, of the same layer, distinct, ordered
+        and not additive scripts. Used to build scripts from the parts of existing scripts.
+        """
+        character = None
+        if children[0].layer == 0:
+            _char_set = {c.character for c in children}
+            for key, value in REMARKABLE_ADDITION.items():
+                if _char_set == value:
+                    character = key
+                    break
+
+        if character is not None:
+            string = character + LAYER_MARKS[0]
+            children = REMARKABLE_ADDITION_SCRIPT_ORDERED[character]
+        else:
+            string = '+'.join([str(child) for child in children])
+
+        instance = _SCRIPTS_TABLE.get(string)
+        if instance is None:
+            instance = object.__new__(cls)
+            Script.__init__(instance, children=list(children), character=character)
+            instance._compute_attributes()
+            instance.__canonical()
+            instance._str = string
+            instance = _intern(instance)
+
+        return instance
+
+    def _compute_attributes(self):
         if self.character:  # remarkable addition
             self.layer = 0
             self.empty = False
@@ -262,13 +534,20 @@ class AdditiveScript(Script):
             self.paradigm = len(self.children) > 1 or any(child.paradigm for child in self.children)
             self.cardinal = sum((e.cardinal for e in self.children))
 
-        if self.cardinal > MAX_SINGULAR_SEQUENCES:
-            raise TooManySingularSequences(self.cardinal)
-
         self.script_class = max(c.script_class for c in self)
 
-        self.__order()
-        self._do_precompute_str()
+    def _encode(self, buffer):
+        if self.layer == 0:
+            return super()._encode(buffer)
+
+        if len(self.children) <= _BYTES_VALUE_MASK:
+            buffer.append(_BYTES_ADDITION | len(self.children))
+        else:
+            buffer.append(_BYTES_ADDITION)
+            buffer.extend(len(self.children).to_bytes(2, 'big'))
+
+        for child in self.children:
+            child._encode(buffer)
 
     def _do_precompute_str(self):
         self._str = \
@@ -277,8 +556,10 @@ class AdditiveScript(Script):
 
     def __order(self):
         # Ordering of the children
-        self.children.sort()
+        self.children.sort(key=script_sort_key)
+        self.__canonical()
 
+    def __canonical(self):
         if self.layer == 0:
             value = 0b0
             for child in self:
@@ -287,15 +568,56 @@ class AdditiveScript(Script):
         else:
             self.canonical = b''.join([child.canonical for child in self])
 
-    def _compute_singular_sequences(self):
-        # Generating the singular sequence
+        self.sort_key = (self.layer, 1, self.cardinal, self.canonical, 1,
+                         tuple(child.sort_key for child in self.children))
+
+    def _iter_singular_sequences(self):
         if not self.paradigm:
-            return [self]
-        else:
-            # additive proposition has always children set
-            s = [sequence for child in self.children for sequence in child.singular_sequences]
-            s.sort()
-            return s
+            return super()._iter_singular_sequences()
+
+        # merge the children singular sequences, they are already ordered
+        return heapq.merge(*(child.iter_singular_sequences() for child in self.children), key=script_sort_key)
+
+    def _nth_singular_sequence(self, i):
+        if not self.paradigm:
+            return self
+
+        # binary search of the child singular sequence that have i singular sequences lower than it
+        for child in self.children:
+            low, high = 0, child.cardinal
+            while low < high:
+                middle = (low + high) // 2
+                ss = child.nth_singular_sequence(middle)
+                index = self._count_lower(ss)
+                if index == i:
+                    return ss
+                elif index < i:
+                    low = middle + 1
+                else:
+                    high = middle
+
+        raise IndexError("Singular sequence index %d out of range for %s." % (i, str(self)))
+
+    def _count_lower(self, ss):
+        if not self.paradigm:
+            return super()._count_lower(ss)
+
+        return sum(child._count_lower(ss) for child in self.children)
+
+    def _has_singular_sequence(self, ss):
+        if not self.paradigm:
+            return super()._has_singular_sequence(ss)
+
+        return any(child._has_singular_sequence(ss) for child in self.children)
+
+    @property
+    def children_positions(self):
+        """The positions in singular_sequences of the singular sequences of each child."""
+        if self._children_positions is None:
+            index = self.singular_sequences_index
+            self._children_positions = [[index[ss] for ss in child.singular_sequences] for child in self.children]
+
+        return self._children_positions
 
     def _compute_cells(self):
         # we generate one table per children, unless one children is a singular sequence.
@@ -303,9 +625,16 @@ class AdditiveScript(Script):
 
         if any(not c.paradigm for c in self.children):
             # layer 0 -> column paradigm (like I: F: M: O:)
-            return [np.array([[[s]] for s in self.singular_sequences])], [self]
+            return [np.arange(self.cardinal).reshape((-1, 1, 1))], [self]
+
+        # translate the children ss positions as ours
+        index = self.singular_sequences_index
+        cells_index = []
+        for c in self.children:
+            child_index = np.fromiter((index[s] for s in c.singular_sequences), dtype=int, count=c.cardinal)
+            cells_index.extend(child_index[t] for t in c.cells_index)
 
-        return [t for c in self.children for t in c.cells], [t for c in self.children for t in c.tables_script]
+        return cells_index, [t for c in self.children for t in c.tables_script]
 
 
 class MultiplicativeScript(Script):
@@ -366,25 +695,7 @@ class MultiplicativeScript(Script):
 
         super().__init__(children=_children, character=_character)
 
-        # Compute the attributes of this script
-        if self.character:
-            self.layer = 0 if self.character in PRIMITIVES else 1
-            self.paradigm = False
-            self.cardinal = 1
-            self.empty = self.character == 'E'
-        else:
-            self.layer = _children[0].layer + 1
-            self.empty = all((e.empty for e in self.children))
-            self.paradigm = any((e.paradigm for e in self.children))
-
-            self.cardinal = 1
-            for e in self.children:
-                self.cardinal = self.cardinal * e.cardinal
-
-        if self.layer == 0:
-            self.script_class = VERB_CLASS if self.character in REMARKABLE_ADDITION['O'] else NOUN_CLASS
-        else:
-            self.script_class = self.children[0].script_class
+        self._compute_attributes()
 
         if self.layer != 0:
             # check number of children
@@ -405,7 +716,63 @@ class MultiplicativeScript(Script):
         self.__order()
         self._do_precompute_str()
 
-    def _render_children(self, children=None, character=None):
+    @classmethod
+    def _from_trusted(cls, children, character=None):
+        """
+        Build the multiplication of canonical children, without the validation and the canonicalization of the
+        constructor. The caller guarantees that there are three children of the same layer, the empty ones being null
+        scripts, or that the character is a primitive or a remarkable multiplication. Used to build scripts from the
+        parts of existing scripts.
+        """
+        if character is None:
+            layer = children[0].layer + 1
+            string = cls._render_children(children)
+            if layer == 1:
+                character = remarkable_multiplication_lookup_table.get(string)
+
+            if character is not None:
+                string = character
+        else:
+            layer = 0 if character in PRIMITIVES else 1
+            children = [] if layer == 0 else REMARKABLE_MULTIPLICATION_SCRIPT[character]
+            string = character
+
+        string += LAYER_MARKS[layer]
+
+        # an empty multiplication is a null script
+        instance = _SCRIPTS_TABLE.get(string)
+        if instance is None:
+            instance = object.__new__(cls)
+            Script.__init__(instance, children=list(children), character=character)
+            instance._compute_attributes()
+            instance.__order()
+            instance._str = string
+            instance = _intern(instance)
+
+        return instance
+
+    def _compute_attributes(self):
+        if self.character:
+            self.layer = 0 if self.character in PRIMITIVES else 1
+            self.paradigm = False
+            self.cardinal = 1
+            self.empty = self.character == 'E'
+        else:
+            self.layer = self.children[0].layer + 1
+            self.empty = all((e.empty for e in self.children))
+            self.paradigm = any((e.paradigm for e in self.children))
+
+            self.cardinal = 1
+            for e in self.children:
+                self.cardinal = self.cardinal * e.cardinal
+
+        if self.layer == 0:
+            self.script_class = VERB_CLASS if self.character in REMARKABLE_ADDITION['O'] else NOUN_CLASS
+        else:
+            self.script_class = self.children[0].script_class
+
+    @staticmethod
+    def _render_children(children=None, character=None):
         if character:
             return character
         else:
@@ -419,6 +786,21 @@ class MultiplicativeScript(Script):
                     result = str(c) + result
             return result
 
+    def _encode(self, buffer):
+        if self.layer == 0:
+            return super()._encode(buffer)
+
+        if self.layer == 1:
+            # the substance code is packed in the tag
+            buffer.append(_BYTES_MULTIPLICATION | self.children[0].canonical[0])
+            children = self.children[1:]
+        else:
+            buffer.append(_BYTES_MULTIPLICATION)
+            children = self.children
+
+        for child in children:
+            child._encode(buffer)
+
     def _do_precompute_str(self):
         self._str = self._render_children(self.children, self.character) + LAYER_MARKS[self.layer]
 
@@ -428,27 +810,51 @@ class MultiplicativeScript(Script):
         else:
             self.canonical = b''.join([child.canonical for child in self])
 
-    def _compute_singular_sequences(self):
-        # Generate the singular sequence
+        self.sort_key = (self.layer, 1, self.cardinal, self.canonical, 0,
+                         tuple(child.sort_key for child in self.children))
+
+    def _iter_singular_sequences(self):
         if not self.paradigm:
-            return [self]
-        else:
-            children_sequences = []
-            for i in range(0, 3):
-                if not self.children[i].empty:
-                    children_sequences.append([(i, c) for c in self.children[i].singular_sequences])
+            yield self
+            return
+
+        # The singular sequences are ordered by the canonical bytes of their children, that are the children
+        # singular sequences, so the cartesian product of the ordered children singular sequences is ordered.
+        for children in itertools.product(*(child.singular_sequences for child in self.children)):
+            yield MultiplicativeScript._from_trusted(children)
 
-            s = []
-            for triplet in itertools.product(*children_sequences):
-                children = self.children[:]
-                for tpl in triplet:
-                    children[tpl[0]] = tpl[1]
+    def _nth_singular_sequence(self, i):
+        if not self.paradigm:
+            return self
+
+        # the position i is written in the mixed radix of the children cardinals
+        children = []
+        for child in reversed(self.children):
+            i, j = divmod(i, child.cardinal)
+            children.append(child.nth_singular_sequence(j))
 
-                sequence = MultiplicativeScript(children=children)
-                s.append(sequence)
+        return MultiplicativeScript._from_trusted(children[::-1])
 
-            s.sort()
-            return s
+    def _count_lower(self, ss):
+        if not self.paradigm:
+            return super()._count_lower(ss)
+
+        # lexicographic order on the children singular sequences
+        result = 0
+        stride = self.cardinal
+        for child, child_ss in zip(self.children, ss.children):
+            stride //= child.cardinal
+            result += child._count_lower(child_ss) * stride
+            if not child._has_singular_sequence(child_ss):
+                break
+
+        return result
+
+    def _has_singular_sequence(self, ss):
+        if not self.paradigm:
+            return super()._has_singular_sequence(ss)
+
+        return all(child._has_singular_sequence(child_ss) for child, child_ss in zip(self.children, ss.children))
 
     def _compute_cells(self):
         # check how many plurals child
@@ -458,18 +864,13 @@ class MultiplicativeScript(Script):
             # only one plural child, we recurse
             v = plurals_child[0]
 
-            # translate the child ss as ours
-            map_seq = {s.children[v[1]]: s for s in self.singular_sequences}
-
-            def resolve_ss(s):
-                return map_seq[s]
-
+            # the other children are singular, so the child ss positions are ours
             def map_script(s):
-                return MultiplicativeScript(children=[
+                return MultiplicativeScript._from_trusted([
                     self.children[i] if i != v[1] else s for i in range(3)
                 ])
 
-            return [np.vectorize(resolve_ss)(c) for c in v[0].cells], [map_script(c) for c in v[0].tables_script]
+            return list(v[0].cells_index), [map_script(c) for c in v[0].tables_script]
 
         # more than one plural var, we build a multidimensional array
         # Check the table dimension
@@ -480,20 +881,17 @@ class MultiplicativeScript(Script):
         # 1st dim the rows
         # 2nd dim the columns
         # 3rd dim the tabs
-        result = np.zeros(shape=[plurals_child[i][0].cardinal if i < len(plurals_child)
-                                 else 1 for i in range(3)], dtype=object)
-
-        seq_index = [{s:i for i, s in enumerate(v[0].singular_sequences)} for v in plurals_child]
-
-        for s in self.singular_sequences:
-            res = [None, None, None]
-            for i, v in enumerate(plurals_child):
-                res[i] = seq_index[i][s.children[v[1]]]
-
-            result[res[0], res[1], res[2]] = s
+        # the position of a ss is the mixed radix number of its children ss positions (see _nth_singular_sequence),
+        # each plural child contributes along its own dimension.
+        strides = [self.children[1].cardinal * self.children[2].cardinal, self.children[2].cardinal, 1]
+        result = np.zeros((1, 1, 1), dtype=int)
+        for dim, (c, i) in enumerate(plurals_child):
+            shape = [1, 1, 1]
+            shape[dim] = c.cardinal
+            result = result + (np.arange(c.cardinal) * strides[i]).reshape(shape)
 
         if len(plurals_child) == 3:
-            tables_script = [MultiplicativeScript(children=[self.children[0], self.children[1], ss])
+            tables_script = [MultiplicativeScript._from_trusted([self.children[0], self.children[1], ss])
                              for ss in self.children[2].singular_sequences]
         else:
             tables_script = [self]
@@ -503,7 +901,8 @@ class MultiplicativeScript(Script):
 
 class NullScript(Script):
     def __init__(self, layer):
-        super().__init__(children=[])
+        # same structure as the empty multiplications, that are interned as null scripts
+        super().__init__(children=[NullScript(layer=layer - 1)] * 3 if layer != 0 else [])
         self.layer = layer
         self.paradigm = False
         self.empty = True
@@ -512,6 +911,7 @@ class NullScript(Script):
 
         self._do_precompute_str()
         self.canonical = bytes([character_value[self.character]] * pow(3, self.layer))
+        self.sort_key = (self.layer, 0)
         self.script_class = AUXILIARY_CLASS
 
     def __iter__(self):
@@ -520,6 +920,12 @@ class NullScript(Script):
 
         return ([NULL_SCRIPTS[self.layer - 1]] * 3).__iter__()
 
+    def _encode(self, buffer):
+        if self.layer == 0:
+            return super()._encode(buffer)
+
+        buffer.append(_BYTES_NULL | self.layer)
+
     def _do_precompute_str(self):
         result = self.character
         for l in range(0, self.layer + 1):
@@ -527,12 +933,98 @@ class NullScript(Script):
 
         self._str = result
 
-    def _compute_singular_sequences(self):
-        return [self]
-
 
 NULL_SCRIPTS = [NullScript(level) for level in range(0, MAX_LAYER)]
 
+# The layer 0 scripts indexed by their binary encoding, filled by from_bytes
+_LAYER_0_SCRIPTS = {}
+_PRIMITIVES_BY_VALUE = {v: c for c, v in character_value.items()}
+
+
+def _layer_0_script(value):
+    if value not in _LAYER_0_SCRIPTS:
+        if value == 0 or value & ~_BYTES_VALUE_MASK:
+            raise InvalidScript("Invalid layer 0 script code %d." % value)
+
+        primitives = [MultiplicativeScript(character=c) if c != 'E' else NULL_SCRIPTS[0]
+                      for v, c in sorted(_PRIMITIVES_BY_VALUE.items()) if v & value]
+
+        _LAYER_0_SCRIPTS[value] = primitives[0] if len(primitives) == 1 else AdditiveScript(children=primitives)
+
+    return _LAYER_0_SCRIPTS[value]
+
+
+def from_bytes(data):
+    """
+    Decode a script from its binary encoding (see Script.to_bytes), without the parser.
+
+    :param data: the bytes returned by Script.to_bytes
+    :return: the script
+    """
+    data = memoryview(data)
+    position = 0
+
+    def decode():
+        nonlocal position
+        if position >= len(data):
+            raise InvalidScript("Truncated script encoding.")
+
+        tag = data[position]
+        position += 1
+        kind = tag & _BYTES_KIND_MASK
+
+        if kind == 0:
+            return _layer_0_script(tag)
+
+        if kind == _BYTES_NULL:
+            layer = tag & _BYTES_VALUE_MASK
+            if not 0 < layer <= MAX_LAYER:
+                raise InvalidScript("Invalid null script code %d." % tag)
+            return NULL_SCRIPTS[layer] if layer < len(NULL_SCRIPTS) else NullScript(layer=layer)
+
+        if kind == _BYTES_MULTIPLICATION:
+            if tag & _BYTES_VALUE_MASK:
+                children = [_layer_0_script(tag & _BYTES_VALUE_MASK), decode(), decode()]
+            else:
+                children = [decode(), decode(), decode()]
+
+                if children[0].layer == 0:
+                    raise InvalidScript("Invalid encoding of a layer 1 multiplication.")
+
+            if not children[0].layer == children[1].layer == children[2].layer:
+                raise InvalidScript("Inconsistent layers in children")
+
+            if children[0].layer + 1 > MAX_LAYER:
+                raise InvalidScript("Invalid script layer %d." % (children[0].layer + 1))
+
+            result = MultiplicativeScript._from_trusted(children)
+        else:
+            count = tag & _BYTES_VALUE_MASK
+            if count == 0:
+                count = int.from_bytes(data[position:position + 2], 'big')
+                position += 2
+
+            children = [decode() for _ in range(count)]
+            if any(c.layer != children[0].layer for c in children):
+                raise IncompatiblesScriptsLayers(children[0], next(c for c in children if c.layer != children[0].layer))
+
+            if len(children) < 2 or any(isinstance(c, AdditiveScript) for c in children) or \
+                    len(set(children)) != len(children):
+                raise InvalidScript("Invalid addition children.")
+
+            result = AdditiveScript._from_trusted(sorted(children, key=script_sort_key))
+
+        if result.cardinal > MAX_SINGULAR_SEQUENCES:
+            raise TooManySingularSequences(result.cardinal)
+
+        return result
+
+    result = decode()
+    if position != len(data):
+        raise InvalidScript("Trailing bytes after the script encoding.")
+
+    return result
+
 # Building the remarkable multiplication to parser
 REMARKABLE_MULTIPLICATION_SCRIPT = {
     "wo": [MultiplicativeScript(character='U'), MultiplicativeScript(character='U'), NullScript(layer=0)],
@@ -568,4 +1060,6 @@ REMARKABLE_MULTIPLICATION_SCRIPT = {
 
 # Building the remarkable addition to parser
 REMARKABLE_ADDITION_SCRIPT = {key: [MultiplicativeScript(character=c) if c != 'E' else NullScript(layer=0) for c in REMARKABLE_ADDITION[key]] for key in REMARKABLE_ADDITION}
+REMARKABLE_ADDITION_SCRIPT_ORDERED = {key: sorted(value, key=script_sort_key) for key, value in
+                                      REMARKABLE_ADDITION_SCRIPT.items()}
 
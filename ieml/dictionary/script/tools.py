@@ -1,96 +1,84 @@
 import itertools as it
-from typing import Union, List
+from functools import lru_cache
+from typing import Union, List, Optional
 
-import numpy as np
-from bidict import bidict
+from ieml.commons import LRUCache
+from ieml.dictionary.script import MultiplicativeScript, Script, AdditiveScript, script_sort_key
+from ieml.dictionary.script.script import NULL_SCRIPTS, _bits
+from ieml.exceptions import IncompatiblesScriptsLayers
 
-from ieml.dictionary.script import MultiplicativeScript, Script, AdditiveScript
 
+def _popcount(mask):
+    return bin(mask).count('1')
 
-def factor(sequences):
-    layer = next(iter(sequences)).layer
 
-    if layer == 0:
-        return list(sequences)
+def _max_cube(sequences):
+    """
+    Find a greedy maximal cube of singular sequences, a product substances x attributes x modes that is included in
+    sequences. The children are numbered along each axis, and the topology is stored as bitsets : rows[x][y] is the
+    bitmask of the modes z such that (x, y, z) is in sequences.
+
+    :return: the tuple of the substances, attributes and modes lists of the cube
+    """
+    axes = [sorted({s.children[i] for s in sequences}, key=script_sort_key) for i in range(3)]
+    index = [{c: i for i, c in enumerate(axis)} for axis in axes]
+
+    points = sorted(tuple(index[i][c] for i, c in enumerate(s.children)) for s in sequences)
+
+    rows = [[0] * len(axes[1]) for _ in axes[0]]
+    for x, y, z in points:
+        rows[x][y] |= 1 << z
+
+    # the degree of a point p is the number of points q such that (q0, p1, p2), (p0, q1, p2) and (p0, p1, q2)
+    # are also in the sequences, ie the number of points it can potentially be factorized with
+    def degree(p):
+        a, b, c = p
+        xs = [x for x in range(len(axes[0])) if rows[x][b] >> c & 1]
+        ys = [y for y in range(len(axes[1])) if rows[a][y] >> c & 1]
+        zs = rows[a][b]
+        return sum(_popcount(rows[x][y] & zs) for x in xs for y in ys)
+
+    degrees = {p: degree(p) for p in points}
+    candidates = sorted(points, key=lambda p: -degrees[p])
+
+    # the points are added in decreasing degree while the cube stay included in the sequences. A point that can't
+    # be added to a cube can't be added to a larger one.
+    x, y, z = candidates[0]
+    cube = [1 << x, 1 << y, 1 << z]
+    for x, y, z in candidates[1:]:
+        _cube = [cube[0] | 1 << x, cube[1] | 1 << y, cube[2] | 1 << z]
+        if _cube == cube:
+            continue
+
+        if all(rows[_x][_y] & _cube[2] == _cube[2] for _x in _bits(_cube[0]) for _y in _bits(_cube[1])):
+            cube = _cube
 
-    if len(sequences) == 1:
-        return list(sequences)
+    return tuple([axes[i][j] for j in _bits(cube[i])] for i in range(3))
 
-    # holds the attributes/substances/modes as individual sets in primitives[0]/primitives[1]/primitives[2] respectively
-    primitives = (set(seme) for seme in zip(*sequences))
 
-    # same but now there is a bijection between the coordinate system and the primitives semes
-    primitives = [bidict({i: s for i, s in enumerate(p_set)}) for p_set in primitives]
+def factor(sequences):
+    """
+    Factorize singular sequences of the same layer as a sum of products.
 
-    # hold the mapping coordinate -> parser
-    scripts = {tuple(primitives[i].inv[seme] for i, seme in enumerate(s)):s for s in sequences}
+    :param sequences: the singular sequences
+    :return: a list of layer 0 scripts if the layer is 0, else a list of tuples (substance, attribute, mode) of
+    factorized scripts
+    """
+    sequences = set(sequences)
+    layer = next(iter(sequences)).layer
 
-    # hold the primitive as coodinate described in scripts keys
-    shape = tuple(len(p) for p in primitives)
-    topology = np.full(shape, False, dtype=bool)
-    for s in scripts:
-        topology[s[0]][s[1]][s[2]] = True
+    if layer == 0 or len(sequences) == 1:
+        return sorted(sequences, key=script_sort_key)
 
-    # calculate the relations, ie for a seq, the others seq that can be factorized with it
-    relations = {}
-    _computed = set()
-    for seq in scripts:
-        if not topology[seq[0]][seq[1]][seq[2]]:
-            continue
+    result = []
+    while sequences:
+        cube = _max_cube(sequences)
+        result.append(tuple([_factorize_sequences_set(frozenset(values))] for values in cube))
 
-        cubes = {e for e in _computed if
-                 topology[e[0]][seq[1]][seq[2]] and
-                 topology[seq[0]][e[1]][seq[2]] and
-                 topology[seq[0]][seq[1]][e[2]]}
-
-        for c in cubes:
-            relations[c].add(seq)
-
-        relations[seq] = cubes
-        _computed.add(seq)
-
-    def _neighbours(t1, t2):
-        x1, y1, z1 = t1
-        x2, y2, z2 = t2
-        yield x1, y1, z1
-        yield x1, y1, z2
-        yield x1, y2, z1
-        yield x1, y2, z2
-        yield x2, y1, z1
-        yield x2, y1, z2
-        yield x2, y2, z1
-        yield x2, y2, z2
-
-    def _factors(candidate, factorisation):
-        # sorting the list of candidate to get the one with the most of potential factors
-        candidate.sort(key=lambda e: len(relations[e]), reverse=True)
-
-        for r in candidate:
-            _facto = set(it.chain.from_iterable(_neighbours(t, r) for t in factorisation))
-            _candidate = set(candidate)
-            for i in _facto:
-                _candidate &= set(relations[i])
-
-            if _candidate:
-                yield from _factors(list(_candidate), _facto)
-            else:
-                yield _facto
-
-        yield factorisation
-
-    _candidate = [r for r in relations]
-    _candidate.sort(key=lambda e: len(relations[e]))
-
-    e = _candidate.pop()
-    factorisations = next(iter(_factors(list(relations[e]), [e])))
-
-    remaining = set(sequences) - set(scripts[f] for f in factorisations)
-    factorisations = tuple(factor({primitives[i][seme] for seme in semes}) for i, semes in enumerate(zip(*factorisations)))
-
-    if remaining:
-        return [factorisations] + factor(remaining)
-    else:
-        return [factorisations]
+        sequences.difference_update(MultiplicativeScript._from_trusted(list(children))
+                                    for children in it.product(*cube))
+
+    return result
 
 
 def pack_factorisation(facto_list):
@@ -104,7 +92,7 @@ def pack_factorisation(facto_list):
             _sum.append(f)
         else:
             # tuple of factorisation
-            _sum.append(MultiplicativeScript(children=(pack_factorisation(l_f) for l_f in f)))
+            _sum.append(MultiplicativeScript._from_trusted([pack_factorisation(l_f) for l_f in f]))
 
     if len(_sum) == 1:
         return _sum[0]
@@ -112,6 +100,11 @@ def pack_factorisation(facto_list):
         return AdditiveScript(children=_sum)
 
 
+@lru_cache(maxsize=10000)
+def _factorize_sequences_set(sequences):
+    return pack_factorisation(factor(sequences))
+
+
 def promote(script: Script, layer: int):
     """
     Promote script to layer by multiplying it with null scripts (E:)
@@ -122,7 +115,7 @@ def promote(script: Script, layer: int):
     old_layer = script.layer
 
     for l in range(old_layer, layer):
-        script = MultiplicativeScript(children=[script])
+        script = MultiplicativeScript._from_trusted([script, NULL_SCRIPTS[l], NULL_SCRIPTS[l]])
 
     return script
 
@@ -146,5 +139,113 @@ def factorize(script: Union[Script, List[Script]],
     else:
         raise ValueError
 
-    result = pack_factorisation(factor(seqs))
-    return result
+    return _factorize_sequences_set(frozenset(seqs))
+
+
+def _factorize_sequences(seqs) -> Optional[Script]:
+    if not seqs:
+        return None
+
+    return _factorize_sequences_set(frozenset(seqs))
+
+
+def _check_layers(s1: Script, s2: Script):
+    if s1.layer != s2.layer:
+        raise IncompatiblesScriptsLayers(s1, s2)
+
+
+# The set operations work on the bitmasks of the singular sequences over the numbering of a common script (see
+# Script.common_mask) : the root paradigm of the operands if given, else the first operand. The containment, equality
+# and disjoint cases are read on the masks, only the other results are factorized. The results are cached by the
+# strings of the operands, the cache does not keep the operands alive in the intern table.
+
+_SET_OPERATIONS_CACHE = LRUCache(maxsize=10000)
+
+
+def _cached(operation, s1: Script, s2: Script, root: Optional[Script]):
+    _check_layers(s1, s2)
+    key = (operation.__name__, s1._str, s2._str, root._str if root is not None else None)
+    return _SET_OPERATIONS_CACHE.get(key, lambda _: operation(s1, s2, root))
+
+
+def _from_mask(numbering: Script, mask: int) -> Optional[Script]:
+    """The factorized script of the singular sequences of numbering in mask"""
+    return _factorize_sequences([numbering.singular_sequences[i] for i in _bits(mask)])
+
+
+def _union(s1, s2, root):
+    if root is not None:
+        m1, m2 = s1.ss_mask(root), s2.ss_mask(root)
+        mask = m1 | m2
+        return s1 if mask == m1 else s2 if mask == m2 else _from_mask(root, mask)
+
+    # the singular sequences of s2 that are in s1
+    common = s1.common_mask(s2)
+    if common == s2.ss_mask():
+        return s1
+    if _popcount(common) == s1.cardinal:
+        return s2
+
+    return _factorize_sequences(s1.singular_sequences +
+                                [s2.singular_sequences[i] for i in _bits(s2.ss_mask() & ~common)])
+
+
+def _intersection(s1, s2, root):
+    if root is not None:
+        m1, m2 = s1.ss_mask(root), s2.ss_mask(root)
+        numbering, mask = root, m1 & m2
+    else:
+        # the singular sequences of s1 that are in s2
+        m1, mask = s1.ss_mask(), s2.common_mask(s1)
+        m2 = mask if _popcount(mask) == s2.cardinal else None
+        numbering = s1
+
+    if not mask:
+        return None
+    if mask == m1:
+        return s1
+    if mask == m2:
+        return s2
+
+    return _from_mask(numbering, mask)
+
+
+def _difference(s1, s2, root):
+    if root is not None:
+        numbering, m1 = root, s1.ss_mask(root)
+        mask = m1 & ~s2.ss_mask(root)
+    else:
+        numbering, m1 = s1, s1.ss_mask()
+        mask = m1 & ~s2.common_mask(s1)
+
+    if not mask:
+        return None
+    if mask == m1:
+        return s1
+
+    return _from_mask(numbering, mask)
+
+
+def union(s1: Script, s2: Script, root: Script = None) -> Script:
+    """
+    :param root: a script that contains s1 and s2, usually their root paradigm, to reuse the masks of the scripts
+    over its numbering
+    :return: the factorized script of the singular sequences of s1 or s2
+    """
+    return _cached(_union, s1, s2, root)
+
+
+def intersection(s1: Script, s2: Script, root: Script = None) -> Optional[Script]:
+    """
+    :param root: a script that contains s1 and s2, see union
+    :return: the factorized script of the singular sequences of s1 and s2, None if they are disjoint
+    """
+    return _cached(_intersection, s1, s2, root)
+
+
+def difference(s1: Script, s2: Script, root: Script = None) -> Optional[Script]:
+    """
+    :param root: a script that contains s1 and s2, see union
+    :return: the factorized script of the singular sequences of s1 not in s2, None if there is none
+    """
+    return _cached(_difference, s1, s2, root)
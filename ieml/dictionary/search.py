@@ -0,0 +1,198 @@
+import re
+import unicodedata
+from bisect import bisect_left
+from collections import defaultdict
+from typing import List
+
+import numpy as np
+
+from ieml.commons import locked_cached_property
+from ieml.constants import LANGUAGES
+from ieml.dictionary.snapshot import strings_sections
+
+# Full text search in the translations and comments of the dictionary. For each language, the inverted index maps
+# each token of the texts (accents removed and case folded) to the scripts that contain it, as csr arrays :
+#  - tokens : the sorted tokens, the prefixes of a query token are a range of this list,
+#  - indptr, indices, data : the scripts indices of each token and their weight, the weight of the fields containing
+#    the token in the script texts.
+
+_WORD = re.compile(r'\w+')
+
+# the weight of the tokens of each field
+FIELDS_WEIGHTS = {'translations': 1.0, 'comments': 0.3}
+
+# the weight of a token matched by a query token prefix and by a fuzzy match (times the trigram similarity)
+PREFIX_WEIGHT = 0.5
+FUZZY_WEIGHT = 0.5
+
+# the minimum trigram similarity of the fuzzy matches
+FUZZY_THRESHOLD = 0.3
+
+
+def normalize(text: str) -> str:
+    """
+    :return: the text without accents and case folded
+    """
+    return ''.join(c for c in unicodedata.normalize('NFKD', text) if not unicodedata.combining(c)).casefold()
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    :return: the list of the normalized words of the text
+    """
+    return _WORD.findall(normalize(text))
+
+
+def _trigrams(token: str) -> set:
+    # padded as in the postgresql pg_trgm module, the starts of the tokens weight more
+    padded = '  ' + token + ' '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class LanguageIndex:
+    """The inverted index of the texts of a language."""
+    def __init__(self, tokens: List[str], indptr: np.ndarray, indices: np.ndarray, data: np.ndarray, size: int):
+        """
+        :param tokens: the sorted tokens
+        :param indptr: the csr arrays of the scripts of each token
+        :param indices:
+        :param data:
+        :param size: the number of scripts
+        """
+        self.tokens = tokens
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.size = size
+
+        # the tokens found in few scripts weight more
+        self.idf = np.log(1 + size / np.maximum(np.diff(indptr), 1))
+
+    @classmethod
+    def build(cls, texts: List[List[tuple]]) -> 'LanguageIndex':
+        """
+        :param texts: for each script, the list of the (field, text) of the script
+        :return: the index of the texts
+        """
+        postings = defaultdict(dict)
+        for i, fields in enumerate(texts):
+            for field, text in fields:
+                for token in set(tokenize(text)):
+                    postings[token][i] = postings[token].get(i, 0.) + FIELDS_WEIGHTS[field]
+
+        tokens = sorted(postings)
+        indptr = np.zeros(len(tokens) + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum([len(postings[t]) for t in tokens])
+        indices = np.array([i for t in tokens for i in sorted(postings[t])], dtype=np.int32)
+        data = np.array([postings[t][i] for t in tokens for i in sorted(postings[t])], dtype=np.float32)
+
+        return cls(tokens, indptr, indices, data, len(texts))
+
+    @locked_cached_property
+    def trigrams(self):
+        """The dict trigram -> positions of the tokens that contain it, built on the first fuzzy search"""
+        trigrams = defaultdict(list)
+        for position, token in enumerate(self.tokens):
+            for trigram in _trigrams(token):
+                trigrams[trigram].append(position)
+
+        return dict(trigrams)
+
+    def _prefixed(self, token: str) -> range:
+        """The positions of the tokens that start with token"""
+        start = bisect_left(self.tokens, token)
+        end = bisect_left(self.tokens, token[:-1] + chr(ord(token[-1]) + 1))
+        return range(start, end)
+
+    def _similar(self, token: str):
+        """The (position, similarity) of the tokens with a trigram similarity over FUZZY_THRESHOLD"""
+        trigrams = _trigrams(token)
+        shared = defaultdict(int)
+        for trigram in trigrams:
+            for position in self.trigrams.get(trigram, ()):
+                shared[position] += 1
+
+        for position, n in shared.items():
+            similarity = n / (len(trigrams) + len(_trigrams(self.tokens[position])) - n)
+            if similarity >= FUZZY_THRESHOLD:
+                yield position, similarity
+
+    def search(self, query: str, limit: int = 10, fuzzy: bool = False) -> List[int]:
+        """
+        Each query token scores the scripts of the tokens it matches : an equal token, a token it is the prefix of,
+        or with fuzzy a token with a similar trigrams set. The best match of each query token counts.
+
+        :return: the indices of the scripts of best score
+        """
+        scores = np.zeros(self.size)
+        for token in set(tokenize(query)):
+            weights = {}
+            for position in self._prefixed(token):
+                weights[position] = 1. if self.tokens[position] == token else PREFIX_WEIGHT
+
+            if fuzzy:
+                for position, similarity in self._similar(token):
+                    weights[position] = max(weights.get(position, 0.), FUZZY_WEIGHT * similarity)
+
+            best = np.zeros(self.size)
+            for position, weight in weights.items():
+                start, end = self.indptr[position], self.indptr[position + 1]
+                indices = self.indices[start:end]
+                best[indices] = np.maximum(best[indices], self.data[start:end] * weight * self.idf[position])
+
+            scores += best
+
+        # the scripts of same score in the order of the dictionary
+        ranked = np.argsort(-scores, kind='stable')[:limit]
+        return [int(i) for i in ranked if scores[i] > 0]
+
+
+class SearchIndex:
+    """The inverted indexes of the translations and comments of the dictionary scripts, one per language."""
+    def __init__(self, languages):
+        """
+        :param languages: the dict language -> LanguageIndex
+        """
+        self.languages = languages
+
+    @classmethod
+    def build(cls, dictionary) -> 'SearchIndex':
+        """
+        :param dictionary: the dictionary, with its translations and comments
+        :return: the index of its texts
+        """
+        return cls({lang: LanguageIndex.build([[(field, getattr(dictionary, field)[s][lang])
+                                                 for field in FIELDS_WEIGHTS] for s in dictionary.scripts])
+                    for lang in LANGUAGES})
+
+    def sections(self):
+        """
+        :return: the list of the (name, array) sections of the index in a snapshot
+        """
+        result = []
+        for lang, index in self.languages.items():
+            result.extend(strings_sections('search_{}_tokens'.format(lang), index.tokens))
+            result.extend([('search_{}_indptr'.format(lang), index.indptr),
+                           ('search_{}_indices'.format(lang), index.indices),
+                           ('search_{}_data'.format(lang), index.data)])
+        return result
+
+    @classmethod
+    def from_snapshot(cls, snapshot) -> 'SearchIndex':
+        """
+        :param snapshot: a DictionarySnapshot
+        :return: the index stored in the snapshot
+        """
+        return cls({lang: LanguageIndex(snapshot.strings('search_{}_tokens'.format(lang)),
+                                        snapshot.section('search_{}_indptr'.format(lang)),
+                                        snapshot.section('search_{}_indices'.format(lang)),
+                                        snapshot.section('search_{}_data'.format(lang)),
+                                        snapshot.size)
+                    for lang in LANGUAGES})
+
+    def search(self, query: str, lang: str, limit: int = 10, fuzzy: bool = False) -> List[int]:
+        """See LanguageIndex.search"""
+        if lang not in self.languages:
+            raise ValueError("Unknown language {}, must be one of {}".format(lang, ', '.join(self.languages)))
+
+        return self.languages[lang].search(query, limit=limit, fuzzy=fuzzy)
@@ -0,0 +1,252 @@
+import json
+import mmap
+import os
+import struct
+import weakref
+from typing import List
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from ieml.constants import LANGUAGES
+from ieml.dictionary.relation.relations import RELATIONS
+from ieml.dictionary.script import from_bytes, AdditiveScript, MultiplicativeScript
+
+# Binary snapshot of a Dictionary, read through a memory map. The file is :
+#  - the magic bytes and the format version,
+#  - the length of the json header, the header,
+#  - the sections, numpy arrays aligned on 8 bytes. The header gives the dtype, length and offset of each section
+#    from the start of the sections.
+#
+# The sections are :
+#  - nodes_tag, nodes_children, nodes_children_offsets : the table of the scripts and of all their sub-scripts, each
+#    one once, after its children. The tag is the binary encoding (Script.to_bytes) of the layer 0 and null scripts,
+#    _MULTIPLICATION or _ADDITION for the others, followed by the positions of their children in the table,
+#  - scripts : the position of each script of the dictionary in the nodes table,
+#  - roots_idx : the root paradigms flags,
+#  - scripts_str and its _offsets : the concatenated utf8 strings of the scripts and their offsets,
+#  - translations_<lang>, comments_<lang> and their _offsets : the concatenated utf8 strings and their offsets,
+#  - <relation>_indptr, <relation>_indices, <relation>_data : the csr arrays of each relation,
+#  - tables_script, tables_parent, tables_regular : the index of the script of each table, the position of its parent
+#    table (-1 for the root paradigms) and its regular flag, each table comes after its parent,
+#  - search_<lang>_tokens and its _offsets, search_<lang>_indptr, _indices, _data : the search index of the texts of
+#    each language (see search.SearchIndex).
+
+MAGIC = b'IEMLDICT'
+SNAPSHOT_VERSION = 3
+
+_PREAMBLE = struct.Struct('<8sII')
+_ALIGNMENT = 8
+
+# the tags of the nodes with children, the leaves tags are their one byte encoding, below 0b10000000
+_MULTIPLICATION = 0b10000000
+_ADDITION = 0b11000000
+
+
+def _align(n: int) -> int:
+    return -(-n // _ALIGNMENT) * _ALIGNMENT
+
+
+def _offsets(lengths) -> np.ndarray:
+    return np.concatenate([[0], np.cumsum(lengths, dtype=np.int64)]).astype(np.int64)
+
+
+def strings_sections(name: str, strings: List[str]):
+    encoded = [s.encode('utf8') for s in strings]
+    return [(name, np.frombuffer(b''.join(encoded), dtype=np.uint8)),
+            (name + '_offsets', _offsets([len(e) for e in encoded]))]
+
+
+def _scripts_sections(scripts):
+    tags = []
+    children = []
+    offsets = [0]
+    nodes = {}
+
+    def _node(s):
+        if s not in nodes:
+            if s.layer == 0 or s.empty:
+                tag, = s.to_bytes()
+                node_children = []
+            else:
+                tag = _ADDITION if isinstance(s, AdditiveScript) else _MULTIPLICATION
+                node_children = [_node(c) for c in s.children]
+
+            nodes[s] = len(tags)
+            tags.append(tag)
+            children.extend(node_children)
+            offsets.append(len(children))
+
+        return nodes[s]
+
+    positions = [_node(s) for s in scripts]
+
+    return [('nodes_tag', np.array(tags, dtype=np.uint8)),
+            ('nodes_children', np.array(children, dtype=np.int32)),
+            ('nodes_children_offsets', np.array(offsets, dtype=np.int64)),
+            ('scripts', np.array(positions, dtype=np.int32))]
+
+
+def tables_sections(dictionary):
+    # the tables sorted by depth, the parents come first
+    def _depth(t):
+        return 0 if t.parent is None else _depth(t.parent) + 1
+
+    tables = sorted(dictionary.tables, key=lambda t: (_depth(t), dictionary.index[t.script]))
+    position = {t: i for i, t in enumerate(tables)}
+
+    return [('tables_script', np.array([dictionary.index[t.script] for t in tables], dtype=np.int32)),
+            ('tables_parent', np.array([position[t.parent] if t.parent is not None else -1 for t in tables],
+                                       dtype=np.int32)),
+            ('tables_regular', np.array([t.regular for t in tables], dtype=np.uint8))]
+
+
+def write_snapshot(dictionary, file: str) -> None:
+    """
+    Write the snapshot of the dictionary in file. The file is written in a temporary file then renamed, the processes
+    reading the previous snapshot keep their memory map.
+
+    :param dictionary: the dictionary
+    :param file: the snapshot file
+    """
+    sections = _scripts_sections(dictionary.scripts)
+    sections.append(('roots_idx', np.asarray(dictionary.roots_idx, dtype=np.uint8)))
+    sections.extend(strings_sections('scripts_str', [str(s) for s in dictionary.scripts]))
+
+    for field in ('translations', 'comments'):
+        values = getattr(dictionary, field)
+        for lang in LANGUAGES:
+            sections.extend(strings_sections('{}_{}'.format(field, lang),
+                                              [values[s][lang] for s in dictionary.scripts]))
+
+    for relation in RELATIONS:
+        matrix = dictionary.relations.relations[relation]
+        sections.extend([(relation + '_indptr', matrix.indptr),
+                         (relation + '_indices', matrix.indices),
+                         (relation + '_data', matrix.data)])
+
+    sections.extend(tables_sections(dictionary))
+    sections.extend(dictionary.search_index.sections())
+
+    header = {'sections': {}, 'inhibitions': dictionary._inhibitions, 'size': len(dictionary.scripts)}
+    offset = 0
+    for name, array in sections:
+        header['sections'][name] = [array.dtype.str, len(array), offset]
+        offset = _align(offset + array.nbytes)
+
+    encoded_header = json.dumps(header).encode('utf8')
+    start = _align(_PREAMBLE.size + len(encoded_header))
+
+    tmp_file = '{}.{}.tmp'.format(file, os.getpid())
+    with open(tmp_file, 'wb') as fp:
+        fp.write(_PREAMBLE.pack(MAGIC, SNAPSHOT_VERSION, len(encoded_header)))
+        fp.write(encoded_header)
+        for name, array in sections:
+            # padding up to the aligned offset of the section
+            fp.write(b'\0' * (start + header['sections'][name][2] - fp.tell()))
+            fp.write(np.ascontiguousarray(array).tobytes())
+
+    os.replace(tmp_file, file)
+
+
+def _close_mmap(m: mmap.mmap) -> None:
+    try:
+        m.close()
+    except BufferError:
+        # the arrays still referenced over the map keep it open, it is released with the last of them
+        pass
+
+
+class DictionarySnapshot:
+    """
+    The sections of a snapshot file, as read-only numpy arrays over a memory map of the file. The map is released by
+    close, at the exit of a with block, or when the snapshot is garbage collected. The arrays returned by section and
+    relation keep it alive until they are released.
+    """
+    def __init__(self, file: str):
+        with open(file, 'rb') as fp:
+            self._mmap = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        self._finalizer = weakref.finalize(self, _close_mmap, self._mmap)
+
+        magic, version, header_length = _PREAMBLE.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != SNAPSHOT_VERSION:
+            raise ValueError("'{}' is not a dictionary snapshot of version {}".format(file, SNAPSHOT_VERSION))
+
+        header = json.loads(self._mmap[_PREAMBLE.size:_PREAMBLE.size + header_length].decode('utf8'))
+        start = _align(_PREAMBLE.size + header_length)
+
+        self.size = header['size']
+        self.inhibitions = header['inhibitions']
+        self._sections = {name: np.frombuffer(self._mmap, dtype=np.dtype(dtype), count=length, offset=start + offset)
+                          for name, (dtype, length, offset) in header['sections'].items()}
+
+    def close(self) -> None:
+        """Release the memory map, the sections can't be read after."""
+        self._sections = None
+        self._mmap = None
+        self._finalizer()
+
+    @property
+    def closed(self) -> bool:
+        return not self._finalizer.alive
+
+    def __enter__(self) -> 'DictionarySnapshot':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def _section(self, name: str) -> np.ndarray:
+        if self._sections is None:
+            raise ValueError("I/O operation on a closed dictionary snapshot")
+
+        return self._sections[name]
+
+    def scripts(self) -> np.ndarray:
+        """Build the scripts, each sub-script is built once. The snapshot is trusted, the scripts are not validated."""
+        children = self._section('nodes_children').tolist()
+        offsets = self._section('nodes_children_offsets').tolist()
+        leaves = {}
+
+        nodes = []
+        for i, tag in enumerate(self._section('nodes_tag').tolist()):
+            if tag < _MULTIPLICATION:
+                if tag not in leaves:
+                    leaves[tag] = from_bytes(bytes([tag]))
+                nodes.append(leaves[tag])
+            else:
+                cls = AdditiveScript if tag == _ADDITION else MultiplicativeScript
+                nodes.append(cls._from_trusted([nodes[c] for c in children[offsets[i]:offsets[i + 1]]]))
+
+        result = np.empty(self.size, dtype=object)
+        result[:] = [nodes[i] for i in self._section('scripts').tolist()]
+        return result
+
+    @property
+    def roots_idx(self) -> np.ndarray:
+        return self._section('roots_idx').astype(int)
+
+    def strings(self, name: str) -> List[str]:
+        """
+        :param name: the name of the strings section, as 'scripts_str' or 'translations_fr'
+        :return: the decoded strings
+        """
+        data = self._section(name).tobytes()
+        offsets = self._section(name + '_offsets').tolist()
+        return [data[offsets[i]:offsets[i + 1]].decode('utf8') for i in range(len(offsets) - 1)]
+
+    def section(self, name: str) -> np.ndarray:
+        """The array of the section, over the memory map."""
+        return self._section(name)
+
+    def relation(self, relation: str) -> csr_matrix:
+        """The csr matrix of the relation, over the memory mapped arrays."""
+        return csr_matrix((self._section(relation + '_data'),
+                           self._section(relation + '_indices'),
+                           self._section(relation + '_indptr')), shape=(self.size, self.size), copy=False)
+
+    def tables(self):
+        """
+        :return: the (script index, parent position, regular flag) arrays of the tables
+        """
+        return self._section('tables_script'), self._section('tables_parent'), self._section('tables_regular')
@@ -23,6 +23,26 @@ class Table:
         else:
             return max(self.parent.rank, 1) + 1
 
+    @property
+    def root(self):
+        """The table of the root paradigm of this table"""
+        if self.parent is None:
+            return self
+
+        return self.parent.root
+
+    def contains_script(self, script):
+        """
+        Return True if the script is contained in the script of this table. The singular sequences are compared as
+        bitmasks over the numbering of the root paradigm singular sequences.
+        """
+        root = self.root.script
+        try:
+            return script.ss_mask(root) & ~self.script.ss_mask(root) == 0
+        except ValueError:
+            # not in the root paradigm
+            return False
+
     # @property
     # def partitions(self):
     #     return {t for t in self.relations.contains if isinstance(t, Table) and t.parent == self}
@@ -31,7 +51,8 @@ class Table2D(Table):
     def __init__(self, script, parent, regular=False):
         super().__init__(script, parent, regular)
 
-        if script.tables_script[0] != script or self.script.cells[0].shape[2] != 1 or self.script.cells[0].shape[1] == 1:
+        shape = self.script.cells_index[0].shape
+        if script.tables_script[0] != script or shape[2] != 1 or shape[1] == 1:
             raise ValueError("Invalid script for Table creation: %s. Expected a script that lead a 2d table"%str(script))
 
         self._index = None
@@ -42,7 +63,7 @@ class Table2D(Table):
 
     @property
     def shape(self):
-        return self.cells.shape
+        return self.cells_index.shape
 
     @property
     def rows(self):
@@ -60,20 +81,24 @@ class Table2D(Table):
     def script_columns(self):
         return [factorize(line) for line in self.cells.transpose()]
 
+    @property
+    def cells_index(self):
+        return self.script.cells_index[0][:, :, 0]
+
     @property
     def cells(self):
-        return self.script.cells[0][:, :, 0]
+        return self.script.resolve_cells(self.cells_index)
 
     def __getitem__(self, item):
-        return self.cells[item]
+        return self.script.resolve_cells(self.cells_index[item])
 
     def index_of(self, item):
         if self._index is None:
             self._index = {
-                t: index for index, t in np.ndenumerate(self.cells)
+                int(i): index for index, i in np.ndenumerate(self.cells_index)
             }
 
-        return self._index[script(item)]
+        return self._index[self.script.singular_sequences_index[script(item)]]
 
     def accept_script(self, script):
         """
@@ -130,7 +155,7 @@ class Table2D(Table):
 
             return False, 0
 
-        if script not in self.script:
+        if not self.contains_script(script):
             return False, False
 
         if self.rank != 0 and self.rank % 2 == 0:
@@ -162,25 +187,29 @@ class Table1D(Table):
 
     @property
     def shape(self):
-        return self.cells.shape
+        return self.cells_index.shape
+
+    @property
+    def cells_index(self):
+        return self.script.cells_index[0][:, 0, 0]
 
     @property
     def cells(self):
-        return self.script.cells[0][:, 0, 0]
+        return self.script.resolve_cells(self.cells_index)
 
     def __getitem__(self, item):
-        return self.cells[item]
+        return self.script.resolve_cells(self.cells_index[item])
 
     def index_of(self, item):
         if self._index is None:
             self._index = {
-                t: index for index, t in np.ndenumerate(self.cells)
+                int(i): index for index, i in np.ndenumerate(self.cells_index)
             }
 
-        return self._index[script(item)]
+        return self._index[self.script.singular_sequences_index[script(item)]]
 
     def accept_script(self, s):
-        if s not in self.script:
+        if not self.contains_script(s):
             return False, False
 
         coords = sorted([self.index_of(ss) for ss in s.singular_sequences])
@@ -216,6 +245,10 @@ class TableSet(Table):
     def tables(self):
         return self.script.tables_script
 
+    @property
+    def cells_index(self):
+        return self.script.cells_index
+
     @property
     def cells(self):
         return self.script.cells
@@ -230,9 +263,20 @@ class TableSet(Table):
         if isinstance(self.parent, TableSet):
             return False, False
 
-        tables = [table for table in self.script.tables_script if table in script]
+        root = self.root.script
+        try:
+            mask = script.ss_mask(root)
+        except ValueError:
+            return False, False
+
+        # union of the tables contained in script
+        tables_mask = 0
+        for table in self.script.tables_script:
+            table_mask = table.ss_mask(root)
+            if table_mask & ~mask == 0:
+                tables_mask |= table_mask
 
-        if len(tables) >= 1 and {ss for t in tables for ss in t.singular_sequences} == set(script.singular_sequences):
+        if tables_mask != 0 and tables_mask == mask:
             return True, False
 
         return False, False
@@ -252,7 +296,7 @@ def table_class(script):
         return Cell
 
     if len(script.tables_script) == 1:
-        dim = sum(1 for s in script.cells[0].shape if s != 1)
+        dim = sum(1 for s in script.cells_index[0].shape if s != 1)
         if dim == 1:
             return Table1D
         if dim == 2:
@@ -260,7 +304,7 @@ def table_class(script):
 
         raise ValueError("Invalid dim %d for script %s"%(dim, str(script)))
     else:
-        if len(script.cells) == 1:
+        if len(script.cells_index) == 1:
             return Table3D
         else:
             return TableSet
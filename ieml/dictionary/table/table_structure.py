@@ -19,6 +19,29 @@ class TableStructure:
         self.roots = root_paradigms
         self.table_to_root = {t: r for r, t_s in self.roots.items() for t in t_s}
 
+    @classmethod
+    def from_parents(cls, scripts, parents, regular):
+        """
+        Rebuild a table structure from the parent of each table, without searching the parents.
+
+        :param scripts: the scripts of the tables, each table comes after its parent
+        :param parents: the position of the parent of each table in scripts, -1 for the root paradigms
+        :param regular: the regular flag of each table
+        :return: the table structure
+        """
+        tables = []
+        for s, p, r in zip(scripts, parents, regular):
+            tables.append(table_class(s)(script=s, parent=tables[p] if p >= 0 else None, regular=bool(r)))
+
+        structure = cls.__new__(cls)
+        structure.tables = {t.script: t for t in tables}
+        structure.roots = defaultdict(set)
+        for t in tables:
+            structure.roots[t.root.script].add(t)
+        structure.roots = dict(structure.roots)
+        structure.table_to_root = {t: r for r, t_s in structure.roots.items() for t in t_s}
+        return structure
+
     def __iter__(self):
         yield from self.tables.values()
 
@@ -68,7 +91,12 @@ class TableStructure:
         return tables, cells
 
     @staticmethod
-    def _build_tables(root_scripts, scripts):
+    def assign_paradigms(root_scripts, scripts):
+        """
+        :param root_scripts: the root paradigms
+        :param scripts: the scripts of the dictionary
+        :return: the dict root paradigm -> list of the paradigms of scripts in the root paradigm
+        """
         roots = defaultdict(list)
         root_ss = {}
 
@@ -83,6 +111,12 @@ class TableStructure:
 
             roots[root_ss[s.singular_sequences[0]]].append(s)
 
+        return roots
+
+    @staticmethod
+    def _build_tables(root_scripts, scripts):
+        roots = TableStructure.assign_paradigms(root_scripts, scripts)
+
         root_paradigms = {}
         for root in root_scripts:
             tables, cells = TableStructure._define_root(root=root, paradigms=roots[root])
@@ -1,8 +1,6 @@
 import logging
-import os
 import ply.yacc as yacc
 
-from ieml import PARSER_FOLDER
 from ieml.dictionary.script import script
 from ieml.exceptions import TermNotFoundInDictionary, InvalidIEMLObjectArgument
 from ieml.lexicon.grammar import Text, word
@@ -12,7 +10,7 @@ from ieml.lexicon.grammar.word import Word
 from ieml.exceptions import CannotParse
 
 from .lexer import get_lexer, tokens
-import threading
+from ieml.commons import LRUCache, ThreadLocalParser
 
 def _add(lp1, p2):
     return lp1[0] + [p2[0]], lp1[1] + p2[1]
@@ -54,7 +52,8 @@ class IEMLParserSingleton(type):
 
 class IEMLParser(metaclass=IEMLParserSingleton):
     tokens = tokens
-    lock = threading.Lock()
+    start = 'proposition'
+    tabmodule = 'ieml.lexicon.grammar.parser.parsetab'
 
     def __init__(self):
         # from ieml.dictionary.tools import term
@@ -63,21 +62,26 @@ class IEMLParser(metaclass=IEMLParserSingleton):
 
         # Build the lexer and parser
         self.lexer = get_lexer()
-        self.parser = yacc.yacc(module=self, errorlog=logging, start='proposition',
-                                debug=False, optimize=True,
-                                picklefile=os.path.join(PARSER_FOLDER, "ieml_parser.pickle"))
+        self.parser = yacc.yacc(module=self, errorlog=logging, start=self.start, tabmodule=self.tabmodule,
+                                debug=False, optimize=True, write_tables=False)
         self._ieml = None
 
+        self._thread_parser = ThreadLocalParser(self.parser, self.lexer)
+        self.cache = LRUCache(maxsize=4096)
+
     def parse(self, s):
-        """Parses the input string, and returns a reference to the created AST's root"""
-        with self.lock:
-            try:
-                return self.parser.parse(s, lexer=self.lexer)
-            except InvalidIEMLObjectArgument as e:
-                raise CannotParse(s, str(e))
-            except CannotParse as e:
-                e.s = s
-                raise e
+        """Parses the input string, and returns a reference to the created AST's root. The usls are immutable, the
+        instances are shared between the calls with the same string."""
+        return self.cache.get(s, self._parse)
+
+    def _parse(self, s):
+        try:
+            return self._thread_parser.parse(s)
+        except InvalidIEMLObjectArgument as e:
+            raise CannotParse(s, str(e))
+        except CannotParse as e:
+            e.s = s
+            raise e
 
 
     # Parsing rules
@@ -0,0 +1,65 @@
+
+# parsetab.py
+# This file is automatically generated. Do not edit.
+# pylint: disable=W,C,R
+_tabversion = '3.10'
+
+_lr_method = 'LALR'
+
+_lr_signature = 'propositionLBRACKET LITERAL LPAREN L_CURLY_BRACKET PLUS RBRACKET RPAREN R_CURLY_BRACKET SLASH TERM TIMESproposition :  word\n                        | topic\n                        | fact\n                        | theory\n                        | textliteral_list : literal_list LITERAL\n                        | LITERALword : TERM\n                | LBRACKET TERM RBRACKET\n                | LBRACKET TERM RBRACKET literal_listword_sum : word_sum PLUS word\n                    | word\n            clauses_sum : clauses_sum PLUS clause\n                    | clause\n            superclauses_sum : superclauses_sum PLUS superclause\n                    | superclausemorpheme : LPAREN word_sum RPARENtopic : LBRACKET morpheme RBRACKET\n                | LBRACKET morpheme RBRACKET literal_list\n                | LBRACKET morpheme TIMES morpheme RBRACKET\n                | LBRACKET morpheme TIMES morpheme RBRACKET literal_list\n                | LBRACKET morpheme TIMES morpheme TIMES morpheme RBRACKET\n                | LBRACKET morpheme TIMES morpheme TIMES morpheme RBRACKET literal_listclause : LPAREN topic TIMES topic TIMES topic RPARENfact : LBRACKET clauses_sum RBRACKET\n                | LBRACKET clauses_sum RBRACKET literal_listsuperclause : LPAREN fact TIMES fact TIMES fact RPARENtheory : LBRACKET superclauses_sum RBRACKET\n                  | LBRACKET superclauses_sum RBRACKET literal_list closed_proposition : topic\n                               | fact\n                               | theory closed_proposition_list :  closed_proposition_list SLASH SLASH closed_proposition\n                                    | closed_propositiontext : SLASH closed_proposition_list SLASH'
+    
+_lr_action_items = {'TERM':([0,8,14,34,40,48,51,56,62,],[7,10,7,10,7,7,7,10,10,]),'LBRACKET':([0,9,14,40,43,46,48,49,50,51,52,66,67,],[8,22,34,56,57,58,56,57,58,62,22,57,58,]),'SLASH':([0,17,18,19,20,21,24,26,28,35,37,38,41,44,53,55,63,65,68,71,],[9,35,-34,-30,-31,-32,-18,-25,-28,52,-7,-19,-26,-29,-6,-20,-33,-21,-22,-23,]),'$end':([1,2,3,4,5,6,7,23,24,26,28,35,36,37,38,41,44,53,55,65,68,71,],[0,-1,-2,-3,-4,-5,-8,-9,-18,-25,-28,-35,-10,-7,-19,-26,-29,-6,-20,-21,-22,-23,]),'RPAREN':([7,23,24,26,30,33,36,37,38,41,53,55,59,65,68,69,70,71,],[-8,-9,-18,-25,47,-12,-10,-7,-19,-26,-6,-20,-11,-21,-22,72,73,-23,]),'PLUS':([7,12,13,15,16,23,30,33,36,37,42,45,53,59,72,73,],[-8,27,29,-14,-16,-9,48,-12,-10,-7,-13,-15,-6,-11,-24,-27,]),'LPAREN':([8,22,25,27,29,34,54,57,58,62,],[14,14,40,43,46,51,40,40,43,40,]),'RBRACKET':([10,11,12,13,15,16,39,42,45,47,64,72,73,],[23,24,26,28,-14,-16,55,-13,-15,-17,68,-24,-27,]),'TIMES':([11,24,26,31,32,37,38,39,41,47,53,55,60,61,65,68,71,],[25,-18,-25,49,50,-7,-19,54,-26,-17,-6,-20,66,67,-21,-22,-23,]),'LITERAL':([23,24,26,28,36,37,38,41,44,53,55,65,68,71,],[37,37,37,37,53,-7,53,53,53,-6,37,53,37,53,]),}
+
+_lr_action = {}
+for _k, _v in _lr_action_items.items():
+   for _x,_y in zip(_v[0],_v[1]):
+      if not _x in _lr_action:  _lr_action[_x] = {}
+      _lr_action[_x][_k] = _y
+del _lr_action_items
+
+_lr_goto_items = {'proposition':([0,],[1,]),'word':([0,14,40,48,51,],[2,33,33,59,33,]),'topic':([0,9,14,43,49,51,52,66,],[3,19,31,31,60,31,19,69,]),'fact':([0,9,14,46,50,52,67,],[4,20,32,32,61,20,70,]),'theory':([0,9,52,],[5,21,21,]),'text':([0,],[6,]),'morpheme':([8,22,25,34,54,57,62,],[11,11,39,11,64,11,11,]),'clauses_sum':([8,22,34,58,],[12,12,12,12,]),'superclauses_sum':([8,22,],[13,13,]),'clause':([8,22,27,34,58,],[15,15,42,15,15,]),'superclause':([8,22,29,],[16,16,45,]),'closed_proposition_list':([9,],[17,]),'closed_proposition':([9,52,],[18,63,]),'word_sum':([14,40,51,],[30,30,30,]),'literal_list':([23,24,26,28,55,68,],[36,38,41,44,65,71,]),}
+
+_lr_goto = {}
+for _k, _v in _lr_goto_items.items():
+   for _x, _y in zip(_v[0], _v[1]):
+       if not _x in _lr_goto: _lr_goto[_x] = {}
+       _lr_goto[_x][_k] = _y
+del _lr_goto_items
+_lr_productions = [
+  ("S' -> proposition","S'",1,None,None,None),
+  ('proposition -> word','proposition',1,'p_ieml_proposition','parser.py',86),
+  ('proposition -> topic','proposition',1,'p_ieml_proposition','parser.py',87),
+  ('proposition -> fact','proposition',1,'p_ieml_proposition','parser.py',88),
+  ('proposition -> theory','proposition',1,'p_ieml_proposition','parser.py',89),
+  ('proposition -> text','proposition',1,'p_ieml_proposition','parser.py',90),
+  ('literal_list -> literal_list LITERAL','literal_list',2,'p_literal_list','parser.py',95),
+  ('literal_list -> LITERAL','literal_list',1,'p_literal_list','parser.py',96),
+  ('word -> TERM','word',1,'p_word','parser.py',105),
+  ('word -> LBRACKET TERM RBRACKET','word',3,'p_word','parser.py',106),
+  ('word -> LBRACKET TERM RBRACKET literal_list','word',4,'p_word','parser.py',107),
+  ('word_sum -> word_sum PLUS word','word_sum',3,'p_proposition_sum','parser.py',120),
+  ('word_sum -> word','word_sum',1,'p_proposition_sum','parser.py',121),
+  ('clauses_sum -> clauses_sum PLUS clause','clauses_sum',3,'p_proposition_sum','parser.py',122),
+  ('clauses_sum -> clause','clauses_sum',1,'p_proposition_sum','parser.py',123),
+  ('superclauses_sum -> superclauses_sum PLUS superclause','superclauses_sum',3,'p_proposition_sum','parser.py',124),
+  ('superclauses_sum -> superclause','superclauses_sum',1,'p_proposition_sum','parser.py',125),
+  ('morpheme -> LPAREN word_sum RPAREN','morpheme',3,'p_morpheme','parser.py',137),
+  ('topic -> LBRACKET morpheme RBRACKET','topic',3,'p_topic','parser.py',141),
+  ('topic -> LBRACKET morpheme RBRACKET literal_list','topic',4,'p_topic','parser.py',142),
+  ('topic -> LBRACKET morpheme TIMES morpheme RBRACKET','topic',5,'p_topic','parser.py',143),
+  ('topic -> LBRACKET morpheme TIMES morpheme RBRACKET literal_list','topic',6,'p_topic','parser.py',144),
+  ('topic -> LBRACKET morpheme TIMES morpheme TIMES morpheme RBRACKET','topic',7,'p_topic','parser.py',145),
+  ('topic -> LBRACKET morpheme TIMES morpheme TIMES morpheme RBRACKET literal_list','topic',8,'p_topic','parser.py',146),
+  ('clause -> LPAREN topic TIMES topic TIMES topic RPAREN','clause',7,'p_clause','parser.py',175),
+  ('fact -> LBRACKET clauses_sum RBRACKET','fact',3,'p_fact','parser.py',181),
+  ('fact -> LBRACKET clauses_sum RBRACKET literal_list','fact',4,'p_fact','parser.py',182),
+  ('superclause -> LPAREN fact TIMES fact TIMES fact RPAREN','superclause',7,'p_superclause','parser.py',189),
+  ('theory -> LBRACKET superclauses_sum RBRACKET','theory',3,'p_theory','parser.py',194),
+  ('theory -> LBRACKET superclauses_sum RBRACKET literal_list','theory',4,'p_theory','parser.py',195),
+  ('closed_proposition -> topic','closed_proposition',1,'p_closed_proposition','parser.py',202),
+  ('closed_proposition -> fact','closed_proposition',1,'p_closed_proposition','parser.py',203),
+  ('closed_proposition -> theory','closed_proposition',1,'p_closed_proposition','parser.py',204),
+  ('closed_proposition_list -> closed_proposition_list SLASH SLASH closed_proposition','closed_proposition_list',4,'p_closed_proposition_list','parser.py',208),
+  ('closed_proposition_list -> closed_proposition','closed_proposition_list',1,'p_closed_proposition_list','parser.py',209),
+  ('text -> SLASH closed_proposition_list SLASH','text',3,'p_text','parser.py',216),
+]
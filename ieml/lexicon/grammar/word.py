@@ -3,6 +3,7 @@ from itertools import product, combinations, chain
 from operator import mul
 from typing import List, Union
 
+from ieml.commons import cached_property
 from ieml.lexicon.grammar.character import Character, character
 
 from ieml.dictionary.script import Script, script
@@ -65,8 +66,13 @@ class Word(Usl):
         if self.cardinal > MAX_SINGULAR_SEQUENCES:
             raise InvalidIEMLObjectArgument(Word, "Too many Topic- singular sequences defined (max: 360): %d" % self.cardinal)
 
-        self.singular_sequences = self._build_singular_sequences()
-        self.ancestors = self._build_ancestors()
+    @cached_property
+    def singular_sequences(self):
+        return self._build_singular_sequences()
+
+    @cached_property
+    def ancestors(self):
+        return self._build_ancestors()
 
     def _build_singular_sequences(self):
         characters = []
@@ -1,8 +1,10 @@
 from typing import List, Union
 from collections import defaultdict
-import yaml
 import os
+import sys
+import time
 
+from ieml.commons import load_yaml, map_files
 from ieml.constants import LANGUAGES, LEXICONS_FOLDER
 from ieml.lexicon.grammar import usl, Word
 from ieml.lexicon.relations.lattice_sctrucure import LatticeStructure
@@ -20,51 +22,78 @@ class MultiTranslations:
         raise KeyError("Unknown language {}".format(item))
 
 
+def read_lexicon_file(file: str) -> list:
+    """
+    :param file: a lexicon yaml file
+    :return: the list of the words entries of the file
+    """
+    content = load_yaml(file)
+    return content['Words'] if content['Words'] else []
+
+
+def read_lexicon_files(files: List[str], workers: int = 1) -> List[list]:
+    """
+    Read the lexicon yaml files.
+
+    :param files: the yaml files
+    :param workers: the number of worker processes, see map_files. If 1, the default, the files are read in the
+    current process.
+    :return: the words entries of each file in the order of files
+    """
+    return map_files(read_lexicon_file, files, workers=workers)
+
+
 class Lexicon:
     @classmethod
-    def load(cls, root_folder: str = LEXICONS_FOLDER, names: Union[List[str], None] = None):
+    def load(cls, root_folder: str = LEXICONS_FOLDER, names: Union[List[str], None] = None, workers: int = 1):
+        """
+        :param root_folder: the folder of the lexicons
+        :param names: the lexicons (folders or files of root_folder) to load, all by default
+        :param workers: the number of processes to read the yaml files, see read_lexicon_files
+        """
+        start = time.perf_counter()
         if names is None:
             # add all
             names = os.listdir(root_folder)
 
-        usls = []
-        translations = {}
-        metadatas = {}
+        files = []
         for n in names:
             name = os.path.join(root_folder, n)
 
             if os.path.isdir(name):
-                files = [os.path.join(name, f) for f in os.listdir(name)]
+                files.extend(os.path.join(name, f) for f in os.listdir(name))
             else:
-                files = [name]
-
-            files = [os.path.abspath(f) for f in files]
-
-            for file in files:
-                with open(file) as fp:
-                    file_cnt = yaml.load(fp)
+                files.append(name)
 
-                words = file_cnt['Words'] if file_cnt['Words'] else []
+        files = [os.path.abspath(f) for f in files]
+        contents = read_lexicon_files(files, workers=workers)
+        print("Lexicon.load: Read {} files in {:.2f}s".format(len(files), time.perf_counter() - start), file=sys.stderr)
+        start = time.perf_counter()
 
-                for w in words:
-                    u = usl(w['ieml'])
+        usls = []
+        translations = {}
+        metadatas = {}
+        for file, words in zip(files, contents):
+            for w in words:
+                u = usl(w['ieml'])
 
-                    translations[u] = {}
-                    for l in LANGUAGES:
-                        translations[u][l] = w['translations'][l] if l in w['translations'] and w['translations'][l] \
-                            else []
+                translations[u] = {}
+                for l in LANGUAGES:
+                    translations[u][l] = w['translations'][l] if l in w['translations'] and w['translations'][l] \
+                        else []
 
-                    folder = os.path.basename(os.path.dirname(file))
-                    _file = os.path.basename(file)
-                    metadatas[u] = {'path': _file,
-                                    'name': os.path.join(folder, _file),
-                                    'folder': folder,
-                                    'file': _file}
+                folder = os.path.basename(os.path.dirname(file))
+                _file = os.path.basename(file)
+                metadatas[u] = {'path': _file,
+                                'name': os.path.join(folder, _file),
+                                'folder': folder,
+                                'file': _file}
 
-                    # metadatas[u]['file'] = file
+                # metadatas[u]['file'] = file
 
-                    usls.append(u)
+                usls.append(u)
 
+        print("Lexicon.load: Parsed {} usls in {:.2f}s".format(len(usls), time.perf_counter() - start), file=sys.stderr)
         lexicon = Lexicon(usls=usls, translations=translations, metadatas=metadatas)
         return lexicon
 
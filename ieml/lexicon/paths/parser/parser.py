@@ -1,39 +1,40 @@
 import logging
-from functools import lru_cache
-import threading
 
 from ply import yacc
 
 from ....exceptions import CannotParse
 from .lexer import tokens, get_lexer
 from ..paths import Coordinate, AdditivePath, MultiplicativePath, ContextPath
-from ....commons import Singleton
+from ....commons import Singleton, LRUCache, ThreadLocalParser
 
 
 class PathParser(metaclass=Singleton):
     tokens = tokens
-    lock = threading.Lock()
+    start = 'path'
+    tabmodule = 'ieml.lexicon.paths.parser.parsetab'
 
     def __init__(self):
 
         # Build the lexer and parser
         self.lexer = get_lexer()
-        self.parser = yacc.yacc(module=self, errorlog=logging, start='path',
-                                debug=False, optimize=True, picklefile="parser/path_parser.pickle")
-        # rename the parsing method (can't name it directly parse with lru_cache due to ply checking)
-        self.parse = self.t_parse
+        self.parser = yacc.yacc(module=self, errorlog=logging, start=self.start, tabmodule=self.tabmodule,
+                                debug=False, optimize=True, write_tables=False)
 
-    @lru_cache(maxsize=1024)
-    def t_parse(self, s):
+        self._thread_parser = ThreadLocalParser(self.parser, self.lexer)
+        self.cache = LRUCache(maxsize=1024)
+
+    def parse(self, s):
         """Parses the input string, and returns a reference to the created AST's root"""
+        return self.cache.get(s, self._parse)
+
+    def _parse(self, s):
         # self.root = None
         # self.path = s
-        with self.lock:
-            try:
-                return self.parser.parse(s, lexer=self.lexer, debug=False)
-            except CannotParse as e:
-                e.s = s
-                raise e
+        try:
+            return self._thread_parser.parse(s, debug=False)
+        except CannotParse as e:
+            e.s = s
+            raise e
 
         # if self.root is not None:
         #     if len(self.root.children) == 1:
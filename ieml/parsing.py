@@ -0,0 +1,345 @@
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Dict
+
+from ieml.commons import CacheInfo
+from ieml.constants import LIBRARY_VERSION
+from ieml.exceptions import CannotParse, TooManySingularSequences
+
+# Bulk parsing of ieml strings. The unique strings are parsed in a process pool, the workers send back the results in
+# a compact form (binary encoding of the scripts, nested tuples for the usls and the paths) that is decoded in the
+# calling process, instead of the pickled object graphs with their cached attributes.
+
+KINDS = ('script', 'usl', 'path')
+
+# the errors of the strings that parse but can't be built, reported as CannotParse like the syntax errors
+_BUILD_ERRORS = (TooManySingularSequences,)
+
+_SCRIPT, _WORD, _FACT, _THEORY, _TEXT = range(5)
+
+# a coordinate is encoded as its (kind, index), the other paths as (type, children encodings)
+_ADDITIVE_PATH, _MULTIPLICATIVE_PATH, _CONTEXT_PATH = range(3)
+
+# the number of chunks sent to each worker
+_CHUNKS_PER_WORKER = 4
+
+
+def _parser(kind):
+    if kind == 'script':
+        from ieml.dictionary.script import ScriptParser
+        return ScriptParser()
+    elif kind == 'usl':
+        from ieml.lexicon.grammar.parser import IEMLParser
+        return IEMLParser()
+    else:
+        from ieml.lexicon.paths.parser import PathParser
+        return PathParser()
+
+
+def _encode_usl(u):
+    from ieml.dictionary.script import Script
+    from ieml.lexicon.grammar import Word, Fact, Theory, Text
+
+    if isinstance(u, Script):
+        return _SCRIPT, u.to_bytes()
+
+    if isinstance(u, Word):
+        return _WORD, tuple(tuple(s.to_bytes() for s in char) for char in u.characters), u.literals
+
+    if isinstance(u, (Fact, Theory)):
+        return _FACT if isinstance(u, Fact) else _THEORY, \
+               tuple(tuple(_encode_usl(e) for e in clause) for clause in u.children), u.literals
+
+    if isinstance(u, Text):
+        return _TEXT, tuple(_encode_usl(c) for c in u.children), u.literals
+
+    raise ValueError("Unable to encode the object %s" % str(u))
+
+
+def _decode_usl(encoding):
+    from ieml.dictionary.script import from_bytes
+    from ieml.lexicon.grammar import Word, Fact, Theory, Text
+
+    if encoding[0] == _SCRIPT:
+        return from_bytes(encoding[1])
+
+    if encoding[0] == _WORD:
+        return Word(*[[from_bytes(s) for s in char] for char in encoding[1]], literals=encoding[2])
+
+    if encoding[0] == _TEXT:
+        return Text([_decode_usl(c) for c in encoding[1]], literals=encoding[2])
+
+    clauses = [tuple(_decode_usl(e) for e in clause) for clause in encoding[1]]
+    return (Fact if encoding[0] == _FACT else Theory)(clauses, literals=encoding[2])
+
+
+def _encode_path(p):
+    from ieml.lexicon.paths import Coordinate, AdditivePath, MultiplicativePath
+
+    if isinstance(p, Coordinate):
+        return p.kind, p.index
+
+    if isinstance(p, AdditivePath):
+        path_type = _ADDITIVE_PATH
+    elif isinstance(p, MultiplicativePath):
+        path_type = _MULTIPLICATIVE_PATH
+    else:
+        path_type = _CONTEXT_PATH
+
+    return path_type, tuple(_encode_path(c) for c in p.children)
+
+
+def _decode_path(encoding):
+    from ieml.lexicon.paths import Coordinate, AdditivePath, MultiplicativePath, ContextPath
+
+    if isinstance(encoding[0], str):
+        return Coordinate(*encoding)
+
+    children = [_decode_path(c) for c in encoding[1]]
+    return {_ADDITIVE_PATH: AdditivePath,
+            _MULTIPLICATIVE_PATH: MultiplicativePath,
+            _CONTEXT_PATH: ContextPath}[encoding[0]](children)
+
+
+def _encode(kind, result):
+    if kind == 'script':
+        return result.to_bytes()
+    elif kind == 'usl':
+        return _encode_usl(result)
+    else:
+        return _encode_path(result)
+
+
+def _decode(kind, encoding):
+    if kind == 'script':
+        from ieml.dictionary.script import from_bytes
+        return from_bytes(encoding)
+    elif kind == 'usl':
+        return _decode_usl(encoding)
+    else:
+        return _decode_path(encoding)
+
+
+def _parse_chunk(kind, strings):
+    """
+    Parse the strings in a worker.
+
+    :return: the list of the (True, compact encoding) of the results, or (False, error message) if the string can't
+    be parsed
+    """
+    parser = _parser(kind)
+    result = []
+    for s in strings:
+        try:
+            result.append((True, _encode(kind, parser.parse(s))))
+        except CannotParse as e:
+            result.append((False, e.msg))
+        except _BUILD_ERRORS as e:
+            result.append((False, str(e)))
+
+    return result
+
+
+def _grammar_signature(kind):
+    """The signature of the PLY grammar of the parser of kind, it changes with the grammar rules and tokens."""
+    import ply.yacc as yacc
+
+    parser = _parser(kind)
+    grammar = yacc.ParserReflect({k: getattr(parser, k) for k in dir(parser)})
+    grammar.get_all()
+    return grammar.signature()
+
+
+# the modules that build the scripts and their canonical form, and define their binary encoding : the cached results
+# are outdated when one of them changes
+_SCRIPT_MODULES = ('ieml.dictionary.script.script', 'ieml.dictionary.script.parser.descent')
+
+
+def _modules_signature(modules):
+    """The md5 of the source files of the modules, it changes with their code."""
+    import importlib
+
+    md5 = hashlib.md5()
+    for name in modules:
+        with open(importlib.import_module(name).__file__, 'rb') as fp:
+            md5.update(fp.read())
+
+    return md5.hexdigest()
+
+
+class PersistentParseCache:
+    """
+    Cache of the compact encodings of the parsed strings in a SQLite database, shared by the processes. A new process
+    rebuilds the cached objects from their encoding without parsing them.
+
+    The database file name is a hash of the library version, the grammar, the encoding format and the source of the
+    scripts modules, the databases of the other versions are removed when the cache is opened. The parsing errors are
+    not cached.
+    """
+    # bumped when the encoding of the results changes
+    FORMAT_VERSION = 2
+
+    def __init__(self, kind: str = 'script', cache_folder: str = None):
+        """
+        :param kind: 'script', 'usl' or 'path', the parser to use
+        :param cache_folder: the folder of the database, CACHE_VERSIONS_FOLDER by default
+        """
+        if kind not in KINDS:
+            raise ValueError("Invalid kind %s, must be one of %s" % (kind, ', '.join(KINDS)))
+
+        if cache_folder is None:
+            from ieml import CACHE_VERSIONS_FOLDER
+            cache_folder = CACHE_VERSIONS_FOLDER
+
+        self.kind = kind
+        self.cache_folder = os.path.abspath(cache_folder)
+        self.hits = 0
+        self.misses = 0
+
+        key = "{}:{}:{}:{}:{}".format(LIBRARY_VERSION, self.FORMAT_VERSION, kind, _grammar_signature(kind),
+                                      _modules_signature(_SCRIPT_MODULES))
+        self.cache_file = os.path.join(self.cache_folder, ".parse-cache.{}.{}.sqlite".format(
+            kind, hashlib.md5(key.encode('utf8')).hexdigest()))
+
+        os.makedirs(self.cache_folder, exist_ok=True)
+        for c in self._cache_candidates():
+            if c != self.cache_file:
+                os.remove(c)
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.cache_file, timeout=60, check_same_thread=False)
+        with self._connection:
+            self._connection.execute("CREATE TABLE IF NOT EXISTS parses (string TEXT PRIMARY KEY, encoding BLOB)")
+
+    def _cache_candidates(self) -> List[str]:
+        prefix = ".parse-cache.{}.".format(self.kind)
+        return [os.path.join(self.cache_folder, n) for n in os.listdir(self.cache_folder)
+                if n.startswith(prefix) and n.endswith('.sqlite')]
+
+    def _dumps(self, encoding):
+        # the usl encodings are nested tuples of bytes and str
+        return pickle.dumps(encoding, protocol=pickle.HIGHEST_PROTOCOL) if self.kind == 'usl' else encoding
+
+    def _loads(self, data):
+        return pickle.loads(data) if self.kind == 'usl' else data
+
+    def get_encodings(self, strings: List[str]) -> Dict:
+        """
+        :param strings: the strings to look up
+        :return: the dict string -> compact encoding of the cached strings
+        """
+        result = {}
+        with self._lock:
+            # below the default sqlite limit of the number of parameters
+            for i in range(0, len(strings), 500):
+                chunk = strings[i:i + 500]
+                result.update(self._connection.execute(
+                    "SELECT string, encoding FROM parses WHERE string IN ({})".format(','.join('?' * len(chunk))),
+                    chunk))
+
+            self.hits += len(result)
+            self.misses += len(strings) - len(result)
+
+        return {s: self._loads(e) for s, e in result.items()}
+
+    def set_encodings(self, encodings: Dict) -> None:
+        """
+        :param encodings: the dict string -> compact encoding to store
+        """
+        with self._lock, self._connection:
+            self._connection.executemany("INSERT OR IGNORE INTO parses VALUES (?, ?)",
+                                         [(s, self._dumps(e)) for s, e in encodings.items()])
+
+    def parse(self, s: str):
+        """
+        :param s: the string to parse
+        :return: the object rebuilt from its cached encoding, or parsed and stored in the cache
+        """
+        encodings = self.get_encodings([s])
+        if s in encodings:
+            return _decode(self.kind, encodings[s])
+
+        result = _parser(self.kind).parse(s)
+        self.set_encodings({s: _encode(self.kind, result)})
+        return result
+
+    def cache_info(self) -> CacheInfo:
+        with self._lock:
+            size = self._connection.execute("SELECT COUNT(*) FROM parses").fetchone()[0]
+            return CacheInfo(self.hits, self.misses, None, size)
+
+    def cache_clear(self) -> None:
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM parses")
+            self.hits = 0
+            self.misses = 0
+
+    def close(self) -> None:
+        self._connection.close()
+
+
+def parse_many(strings: Iterable[str], kind: str = 'script', workers: int = None,
+               cache: PersistentParseCache = None) -> List:
+    """
+    Parse a list of ieml strings. The duplicated strings are parsed once.
+
+    :param strings: the strings to parse
+    :param kind: 'script', 'usl' or 'path', the parser to use
+    :param workers: the number of worker processes, the cpu count by default. If 1, the strings are parsed in the
+    current process.
+    :param cache: the persistent cache of the kind of strings to rebuild the objects from and to store the new
+    results in
+    :return: the list of the parsed objects in the order of strings, with a CannotParse exception in place of the
+    strings that can't be parsed or built (too many singular sequences)
+    """
+    if kind not in KINDS:
+        raise ValueError("Invalid kind %s, must be one of %s" % (kind, ', '.join(KINDS)))
+
+    strings = list(strings)
+    # dict keeps the insertion order
+    unique = list(dict.fromkeys(strings))
+
+    results = {}
+    if cache is not None:
+        results.update((s, _decode(kind, encoding)) for s, encoding in cache.get_encodings(unique).items())
+        unique = [s for s in unique if s not in results]
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    workers = min(workers, len(unique))
+
+    # the encodings of the new results, to store in the cache
+    encodings = {}
+    if workers <= 1:
+        for s in unique:
+            try:
+                results[s] = _parser(kind).parse(s)
+            except CannotParse as e:
+                results[s] = e
+            except _BUILD_ERRORS as e:
+                results[s] = CannotParse(s, str(e))
+            else:
+                if cache is not None:
+                    encodings[s] = _encode(kind, results[s])
+    else:
+        size = -(-len(unique) // (workers * _CHUNKS_PER_WORKER))
+        chunks = [unique[i:i + size] for i in range(0, len(unique), size)]
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for chunk, chunk_encodings in zip(chunks, executor.map(_parse_chunk, [kind] * len(chunks), chunks)):
+                for s, (success, encoding) in zip(chunk, chunk_encodings):
+                    if success:
+                        results[s] = _decode(kind, encoding)
+                        encodings[s] = encoding
+                    else:
+                        results[s] = CannotParse(s, encoding)
+
+    if cache is not None and encodings:
+        cache.set_encodings(encodings)
+
+    return [results[s] for s in strings]
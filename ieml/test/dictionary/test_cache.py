@@ -1,9 +1,16 @@
 import os
+import shutil
 import subprocess
+import tempfile
 import unittest
+import weakref
+from unittest import mock
+
+import numpy as np
 
 from ieml.constants import DICTIONARY_FOLDER
-from ieml.dictionary.dictionary import Dictionary, FolderWatcherCache
+from ieml.dictionary.dictionary import Dictionary, FolderWatcherCache, RootBlocksCache
+from ieml.dictionary.snapshot import write_snapshot, DictionarySnapshot
 
 
 class CacheTestCase(unittest.TestCase):
@@ -32,3 +39,117 @@ class CacheTestCase(unittest.TestCase):
         Dictionary.load(DICTIONARY_FOLDER)
         self.assertFalse(self.cache.is_pruned())
 
+    def test_cache_hit_scan(self):
+        Dictionary.load(DICTIONARY_FOLDER)
+
+        # a cache hit scans the dictionary folder once
+        with mock.patch.object(FolderWatcherCache, '_stats', autospec=True,
+                               side_effect=FolderWatcherCache._stats) as stats:
+            Dictionary.load(DICTIONARY_FOLDER)
+            self.assertEqual(stats.call_count, 1)
+
+    def test_fingerprint(self):
+        with tempfile.TemporaryDirectory() as folder, tempfile.TemporaryDirectory() as cache_folder:
+            files = [os.path.join(folder, name) for name in ('a.yaml', 'b.yaml')]
+            for file in files:
+                with open(file, 'w') as fp:
+                    fp.write(file)
+
+            cache = FolderWatcherCache(folder, cache_folder)
+            cache_file = cache.cache_file
+            self.assertTrue(os.path.isfile(cache._fingerprint_file))
+
+            # same content, new modification time
+            os.utime(files[0], ns=(0, 0))
+            self.assertEqual(cache.cache_file, cache_file)
+            self.assertEqual(FolderWatcherCache(folder, cache_folder).cache_file, cache_file)
+
+            with open(files[0], 'a') as fp:
+                fp.write('\n')
+            self.assertNotEqual(cache.cache_file, cache_file)
+
+    def test_snapshot(self):
+        d = Dictionary.load(DICTIONARY_FOLDER, use_cache=False)
+
+        with tempfile.TemporaryDirectory() as folder:
+            file = os.path.join(folder, 'snapshot')
+            write_snapshot(d, file)
+            loaded = Dictionary.from_snapshot(file)
+
+            self.assertEqual(list(loaded.scripts), list(d.scripts))
+            self.assertTrue(all(s0 is s1 for s0, s1 in zip(loaded.scripts, d.scripts)))
+            self.assertEqual(loaded.translations, d.translations)
+            self.assertEqual(loaded.comments, d.comments)
+            self.assertEqual(loaded._inhibitions, d._inhibitions)
+            self.assertListEqual(loaded.roots_idx.tolist(), d.roots_idx.tolist())
+            self.assertEqual(loaded._str_index, d._str_index)
+            for query, lang in [('ocean', 'en'), ('vent', 'fr')]:
+                self.assertListEqual(loaded.search(query, lang), d.search(query, lang))
+
+            for s, t in d.tables.tables.items():
+                self.assertEqual(type(loaded.tables[s]), type(t))
+                self.assertEqual(loaded.tables[s].rank, t.rank)
+                self.assertIs(loaded.tables.table_to_root[loaded.tables[s]], d.tables.table_to_root[t])
+
+            for r, m in d.relations.relations.items():
+                self.assertEqual((loaded.relations.relations[r] != m).nnz, 0)
+
+            loaded.close()
+            self.assertTrue(loaded._snapshot.closed)
+            with self.assertRaises(ValueError):
+                loaded._snapshot.section('scripts')
+
+            # the relations built from the snapshot keep their arrays mapped
+            for r, m in d.relations.relations.items():
+                self.assertEqual((loaded.relations.relations[r] != m).nnz, 0)
+
+            with Dictionary.from_snapshot(file) as loaded:
+                self.assertEqual(loaded.translations, d.translations)
+            self.assertTrue(loaded._snapshot.closed)
+            with self.assertRaises(ValueError):
+                loaded.comments
+
+            snapshot = DictionarySnapshot(file)
+            mapping = weakref.ref(snapshot._mmap)
+            del snapshot
+            self.assertIsNone(mapping())
+
+    def test_root_blocks(self):
+        with tempfile.TemporaryDirectory() as folder, tempfile.TemporaryDirectory() as cache_folder:
+            for name in ('4_oceans.yaml', '4_continents.yaml', '5_European_countries.yaml'):
+                shutil.copy(os.path.join(DICTIONARY_FOLDER, name), folder)
+
+            blocks = RootBlocksCache(cache_folder)
+            self.assertEqual(len(Dictionary.load(folder, use_cache=True, cache_folder=cache_folder).tables.roots), 3)
+            files = set(os.listdir(blocks.folder))
+
+            # a new translation and new inhibitions for the oceans root paradigm
+            with open(os.path.join(folder, '4_oceans.yaml')) as fp:
+                content = fp.read()
+            with open(os.path.join(folder, '4_oceans.yaml'), 'w') as fp:
+                fp.write(content.replace('inhibitions: []', 'inhibitions: [opposed]').replace('Arctic', 'Arctik'))
+
+            d = Dictionary.load(folder, use_cache=True, cache_folder=cache_folder)
+            # the file and the root paradigm block have been replaced
+            self.assertEqual(len(set(os.listdir(blocks.folder)) - files), 2)
+            self.assertEqual(len(files - set(os.listdir(blocks.folder))), 2)
+
+            reference = Dictionary.load(folder, use_cache=False)
+            self.assertListEqual(list(d.scripts), list(reference.scripts))
+            self.assertEqual(d.translations, reference.translations)
+            for s, t in reference.tables.tables.items():
+                self.assertEqual(type(d.tables[s]), type(t))
+                self.assertEqual(d.tables[s].rank, t.rank)
+
+            for r, m in reference.relations.relations.items():
+                self.assertEqual((d.relations.relations[r] != m).nnz, 0)
+
+            # without the snapshot, each block is read once for the tables and the relations
+            for name in os.listdir(cache_folder):
+                if name.startswith('.dictionary-cache.'):
+                    os.remove(os.path.join(cache_folder, name))
+
+            with mock.patch('numpy.load', wraps=np.load) as load:
+                d = Dictionary.load(folder, use_cache=True, cache_folder=cache_folder)
+                self.assertEqual(load.call_count, 3)
+            self.assertEqual(len(d.tables.roots), 3)
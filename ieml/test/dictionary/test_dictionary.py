@@ -1,9 +1,13 @@
+import threading
 import unittest
+from unittest import mock
 
-from ieml.dictionary.dictionary import Dictionary
+from ieml.dictionary.dictionary import Dictionary, get_dictionary_files, read_dictionary_file, \
+    read_dictionary_files
 import numpy as np
 
-from ieml.dictionary.script import Script
+from ieml.dictionary.script import Script, script
+from ieml.dictionary.search import normalize
 
 
 class DictionaryTestCase(unittest.TestCase):
@@ -18,6 +22,65 @@ class DictionaryTestCase(unittest.TestCase):
         for s in self.d.scripts:
             self.assertIsInstance(s, Script)
 
+    def test_read_files(self):
+        files = get_dictionary_files()
+        self.assertListEqual(read_dictionary_files(files, workers=2), [read_dictionary_file(f) for f in files])
+
+        # the process pool is opt-in
+        with mock.patch('concurrent.futures.ProcessPoolExecutor', side_effect=AssertionError("process pool")):
+            Dictionary.load(use_cache=False, components=('translations',))
+
+    def test_components(self):
+        d = Dictionary.load(use_cache=False, components=('translations',))
+        self.assertIn('translations', d.__dict__)
+        self.assertNotIn('relations', d.__dict__)
+        self.assertNotIn('tables', d.__dict__)
+        self.assertEqual(d.translations, self.d.translations)
+
+        relations = []
+        threads = [threading.Thread(target=lambda: relations.append(d.relations)) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(len(relations), 4)
+        self.assertTrue(all(r is relations[0] for r in relations))
+        self.assertIn('tables', d.__dict__)
+
+        with self.assertRaises(ValueError):
+            Dictionary.load(use_cache=False, components=('translation',))
+
+    def test_get_index(self):
+        s = self.d.scripts[10]
+        self.assertEqual(self.d.get_index(str(s)), 10)
+        self.assertEqual(self.d.get_index(s), 10)
+        self.assertIs(self.d[str(s)], s)
+        self.assertIn(str(s), self.d)
+        self.assertIn(s, self.d)
+        self.assertNotIn('wa.wa.-', self.d)
+        self.assertListEqual(list(self.d.get_many([str(s), self.d.scripts[0], str(s)])), [s, self.d.scripts[0], s])
+
+        # a non canonical string is parsed
+        self.assertEqual(self.d.get_index(' ' + str(s)), 10)
+
+        with self.assertRaises(KeyError):
+            self.d.get_index('wa.wa.-')
+
+    def test_search(self):
+        for query, lang in [('ocean', 'en'), ('Océan', 'fr'), ('OCEAN', 'fr'), ('oce', 'en')]:
+            results = self.d.search(query, lang, limit=3)
+            self.assertEqual(len(results), 3)
+            for i in results:
+                self.assertIn('ocean', normalize(self.d.translations[self.d.scripts[i]][lang]))
+
+        self.assertListEqual(self.d.search('oceen', 'en'), [])
+        best = self.d.scripts[self.d.search('oceen', 'en', fuzzy=True)[0]]
+        self.assertIn('ocean', normalize(self.d.translations[best]['en']))
+
+        with self.assertRaises(ValueError):
+            self.d.search('ocean', 'de')
+
     def test_one_hot(self):
         for i, s in enumerate(self.d.scripts):
             oh = self.d.one_hot(s)
@@ -31,3 +94,49 @@ class DictionaryTestCase(unittest.TestCase):
             # print(oh[i-2:i+2], s)
 
             self.assertEqual(oh[i], 1)
+
+    def test_feature_matrix(self):
+        m = self.d.feature_matrix()
+        self.assertIsInstance(m, np.ndarray)
+        self.assertEqual(m.shape, (len(self.d), len(self.d.feature_names())))
+        self.assertIs(m, self.d.feature_matrix())
+
+        # built once when several threads ask for it
+        d = Dictionary.load()
+        matrices = []
+        threads = [threading.Thread(target=lambda: matrices.append(d.feature_matrix())) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(len(matrices), 4)
+        self.assertTrue(all(f is matrices[0] for f in matrices))
+
+        features = dict(zip(self.d.feature_names(), m[self.d.index[script("O:M:.")]]))
+        self.assertEqual(features['layer'], 1)
+        self.assertEqual(features['cardinal'], 6)
+        self.assertEqual(features['count_U'], 1)
+        self.assertEqual(features['count_E'], 1)
+        self.assertListEqual([features['0_' + p] for p in 'EUASBT'], [0, 1, 1, 0, 0, 0])
+        self.assertListEqual([features['1_' + p] for p in 'EUASBT'], [0, 0, 0, 1, 1, 1])
+        self.assertListEqual([features['2_' + p] for p in 'EUASBT'], [1, 0, 0, 0, 0, 0])
+        self.assertEqual(features['3_E'], 0)
+
+    def test_feature_matrix_additive_child(self):
+        m = self.d.feature_matrix()
+        names = self.d.feature_names()
+        self.assertEqual(len(names), m.shape[1])
+
+        # a multiplication with an additive child, its canonical bytes are longer than its positions
+        s = script("s.-O:M:.+M:O:.-'")
+        self.assertGreater(len(s.canonical), 3 ** s.layer)
+
+        # the positions of a script are the union of the positions of its singular sequences
+        for s in [s, script("i.B:.-+u.M:.-U:.-'"), script("t.i.-d.i.-t.+M:O:.-'")]:
+            features = dict(zip(names, m[self.d.index[s]]))
+            for position in range(3 ** s.layer):
+                expected = {self.d.FEATURES_PRIMITIVES[k] for ss in s.singular_sequences
+                            for k in range(len(self.d.FEATURES_PRIMITIVES)) if ss.canonical[position] >> k & 1}
+                self.assertSetEqual({p for p in self.d.FEATURES_PRIMITIVES if features['%d_%s' % (position, p)]},
+                                    expected)
@@ -1,9 +1,16 @@
+import bisect
+import gc
+import pickle
 import unittest
+import weakref
 
-from ieml.exceptions import TooManySingularSequences
-from ieml.dictionary.script import script as sc, m
+import dill
+
+from ieml.exceptions import TooManySingularSequences, InvalidScript, IncompatiblesScriptsLayers
+from ieml.dictionary.script import script as sc, m, factorize
 from ieml.constants import AUXILIARY_CLASS, VERB_CLASS, NOUN_CLASS, PRIMITIVES
-from ieml.dictionary.script import MultiplicativeScript, AdditiveScript
+from ieml.dictionary.script import MultiplicativeScript, AdditiveScript, script_sort_key, from_bytes
+from ieml.dictionary.script.tools import union, intersection, difference
 
 scripts = list(map(sc, ["O:.E:M:.-"]))
 
@@ -46,4 +53,158 @@ class TestScript(unittest.TestCase):
 
     def test_str(self):
         self.assertIsNotNone(MultiplicativeScript(character='A')._str)
-        self.assertIsNotNone(AdditiveScript(character='O')._str)
\ No newline at end of file
+        self.assertIsNotNone(AdditiveScript(character='O')._str)
+
+    def test_interning(self):
+        self.assertIs(MultiplicativeScript(character='A'), MultiplicativeScript(character='A'))
+        self.assertIs(sc('A:U:E:.'), sc('wu.'))
+        self.assertIs(AdditiveScript(children=[sc('U:'), sc('A:')]), sc('O:'))
+        self.assertIs(m(sc('wa.'), sc('u.'), sc('O:.')), sc('wa.u.O:.-'))
+
+    def test_single_child_addition(self):
+        for s in (sc('A:'), sc('wa.'), sc('O:'), sc('E:.')):
+            self.assertIs(AdditiveScript(children=[s]), s)
+            self.assertIs(type(AdditiveScript(children=[s])), type(s))
+
+        self.assertIs(AdditiveScript(children=[sc('A:'), sc('A:')]), sc('A:'))
+        self.assertIsInstance(sc('A:.'), MultiplicativeScript)
+        self.assertIs(sc('A:.').children[0], sc('A:'))
+
+    def test_pickle(self):
+        s = sc("M:.-',M:.-',S:.-'B:.-'n.-S:.U:.-',_")
+        s.singular_sequences
+        for s_loaded in (pickle.loads(pickle.dumps(s)), dill.loads(dill.dumps(s))):
+            self.assertIs(s_loaded, s)
+            self.assertListEqual(s_loaded.singular_sequences, s.singular_sequences)
+
+    def test_ss_mask(self):
+        root = sc("O:M:.")
+        self.assertEqual(root.ss_mask(), 0b111111)
+        self.assertEqual(sc("U:M:.").ss_mask(root), 0b000111)
+        self.assertEqual(sc("O:S:.").ss_mask(root), 0b001001)
+
+        for s in root.singular_sequences:
+            self.assertEqual(s.ss_mask(root), 1 << root.singular_sequences_index[s])
+
+        for s0, s1 in [("U:M:.", "O:M:."), ("O:S:.", "U:M:."), ("U:S:+B:.", "U:M:.")]:
+            s0, s1 = sc(s0), sc(s1)
+            self.assertEqual(s0.ss_mask(root) & ~s1.ss_mask(root) == 0, s0 in s1)
+
+        with self.assertRaises(ValueError):
+            sc("M:M:.").ss_mask(root)
+
+    def test_common_mask(self):
+        for s0, s1 in [("M:M:.", "O:M:."), ("O:S:.", "U:M:."), ("U:S:+B:.", "S:+T:M:."),
+                       ("M:M:.-O:M:.-'", "S:M:.-O:S:.-'+s.o.-k.o.-'"), ("M:.-O:.-'", "O:.-M:.-'")]:
+            s0, s1 = sc(s0), sc(s1)
+            for script, root in [(s0, s1), (s1, s0)]:
+                common = script.singular_sequences_set & root.singular_sequences_set
+                self.assertEqual(script.common_mask(root),
+                                 sum(1 << i for i, s in enumerate(root.singular_sequences) if s in common))
+
+    def test_sort_key(self):
+        s = sc("M:.-',M:.-',S:.-'B:.-'n.-S:.U:.-',_")
+        scripts = [s] + list(s.tree_iter()) + s.singular_sequences + [sc('E:'), sc('O:'), sc('M:M:.'), sc('E:.-')]
+        by_key = sorted(set(scripts), key=script_sort_key)
+        self.assertListEqual(by_key, sorted(set(scripts)))
+
+        keys = [e.sort_key for e in by_key]
+        for i, e in enumerate(by_key):
+            self.assertEqual(bisect.bisect_left(keys, e.sort_key), i)
+
+    def test_singular_sequences_arithmetic(self):
+        for s in ["O:M:.", "E:E:F:.", "O:", "M:M:.-O:M:.-E:.-+s.y.-'", "O:M:.+M:O:.", "o.O:M:.-",
+                  "M:.-',M:.-',S:.-'B:.-'n.-S:.U:.-',_", "S:.-',S:.-',S:.-'B:.-'n.-S:.U:.-',_"]:
+            s = sc(s)
+            self.assertListEqual(list(s.iter_singular_sequences()), sorted(s.singular_sequences))
+
+            s = sc(str(s))
+            for i, ss in enumerate(s.singular_sequences):
+                self.assertEqual(s.nth_singular_sequence(i), ss)
+                self.assertEqual(s.index_of_singular_sequence(ss), i)
+
+        with self.assertRaises(ValueError):
+            sc("O:M:.").index_of_singular_sequence(sc("M:M:."))
+
+        with self.assertRaises(ValueError):
+            sc("O:M:.").index_of_singular_sequence(sc("U:M:."))
+
+        with self.assertRaises(IndexError):
+            sc("O:M:.").nth_singular_sequence(6)
+
+    def test_singular_sequences_lazy(self):
+        s = MultiplicativeScript(children=[sc("F:M:O:."), sc("M:O:."), sc("O:.")])
+        self.assertEqual(s.cardinal, 360)
+        self.assertEqual(next(s.iter_singular_sequences()), s.nth_singular_sequence(0))
+        self.assertEqual(s.index_of_singular_sequence(s.nth_singular_sequence(-1)), 359)
+        self.assertIsNone(s._singular_sequences)
+
+    def test_from_trusted(self):
+        for s in ["E:.F:.-", "wa.", "O:M:.-", "E:S:.wa.-", "M:O:.-M:O:.-E:.-+s.y.-'"]:
+            s = sc(s)
+            if isinstance(s, MultiplicativeScript):
+                trusted = MultiplicativeScript._from_trusted(list(s.children))
+            else:
+                trusted = AdditiveScript._from_trusted(list(reversed(s.children)))
+            self.assertIs(trusted, s)
+
+        s = MultiplicativeScript._from_trusted([sc("U:"), sc("S:"), sc("E:")])
+        self.assertEqual(str(s), "y.")
+        self.assertIs(s, sc("U:S:E:."))
+        self.assertEqual(s.singular_sequences, [s])
+
+    def test_bytes(self):
+        for s in ["E:", "I:", "U:+S:", "wa.", "E:.", "E:S:.wa.-", "M:O:.-M:O:.-E:.-+s.y.-'", "E:E:E:.-+E:E:A:.-",
+                  "s.o.-k.o.-'"]:
+            s = sc(s)
+            encoding = s.to_bytes()
+            self.assertIsInstance(encoding, bytes)
+            self.assertIs(from_bytes(encoding), s)
+
+        self.assertEqual(sc("wa.").to_bytes(), bytes([0b10000010, 0b00000100, 0b00000001]))
+
+        for invalid in [b'', b'\x00', b'\x80\x02', b'\x02\x02', b'\xc2\x02\x82\x04\x01', b'\x47']:
+            with self.assertRaises(InvalidScript):
+                from_bytes(invalid)
+
+    def test_set_operations(self):
+        a, b, c = sc("M:O:."), sc("S:O:."), sc("O:O:.")
+
+        self.assertIs(a | b, a)
+        self.assertIs(a & b, b)
+        self.assertIs(a - b, sc("B:+T:O:."))
+        self.assertIs(a | c, sc("F:O:."))
+        self.assertIsNone(a & c)
+        self.assertIs(a - c, a)
+        self.assertIsNone(b - a)
+
+        s = sc("M:M:.") - sc("s.")
+        self.assertSetEqual(s.singular_sequences_set, sc("M:M:.").singular_sequences_set - {sc("s.")})
+        self.assertIs(sc("M:M:.") & sc("s."), sc("s."))
+
+        with self.assertRaises(IncompatiblesScriptsLayers):
+            a | sc("M:")
+
+        root = sc("F:O:.")
+        for s0, s1 in [(a, b), (a, c), (b, a), (sc("U:+S:O:."), sc("A:+S:+B:O:.")), (root, c)]:
+            self.assertIs(union(s0, s1, root=root), s0 | s1)
+            self.assertIs(intersection(s0, s1, root=root), s0 & s1)
+            self.assertIs(difference(s0, s1, root=root), s0 - s1)
+
+        # the cache does not keep the operands alive
+        s = m(sc("wa."), sc("u."), sc("M:."))
+        self.assertIs(s - m(sc("wa."), sc("u."), sc("S:.")), m(sc("wa."), sc("u."), sc("B:+T:.")))
+        ref = weakref.ref(s)
+        del s
+        gc.collect()
+        self.assertIsNone(ref())
+
+    def test_factorize(self):
+        for s in ["M:O:.", "M:M:.-O:M:.-'", "s.o.-k.o.-'+M:O:.-M:.-'", "S:M:.e.-M:M:.u.-E:.-+wa.e.-'"]:
+            s = sc(s)
+            self.assertIs(factorize(s), s)
+            self.assertIs(factorize(list(reversed(s.singular_sequences))), s)
+
+        ss = sc("M:M:.").singular_sequences[:5]
+        self.assertSetEqual(factorize(ss).singular_sequences_set, set(ss))
+        self.assertIs(factorize(ss), factorize(list(reversed(ss))))
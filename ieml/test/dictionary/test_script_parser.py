@@ -1,13 +1,25 @@
+import importlib
+import json
+import os
+import re
+import tempfile
 import unittest
+from unittest import mock
+from concurrent.futures import ThreadPoolExecutor
+
+import ply.yacc as yacc
 
 from ieml.constants import DICTIONARY_FOLDER
-from ieml.dictionary.dictionary import Dictionary
-from ieml.dictionary.script.parser import ScriptParser
+from ieml.dictionary.dictionary import Dictionary, get_dictionary_files
+from ieml.dictionary.script.parser import ScriptParser, descent
 from ieml.dictionary.script import AdditiveScript, MultiplicativeScript, NullScript
 
 # from ieml.dictionary import Dictionary
 from ieml.dictionary.script import script as sc
 from ieml.exceptions import CannotParse
+from ieml import parse_many
+from ieml.parsing import PersistentParseCache
+from ieml.lexicon.grammar import usl
 
 
 class TestTermParser(unittest.TestCase):
@@ -120,6 +132,136 @@ class TestTermParser(unittest.TestCase):
         s2 = sc('E:O:.T:M:.-')
         self.assertLess(s2, s1)
 
+    def test_descent_parser(self):
+        # differential test of the descent parser against the PLY parser over all the definitions
+        definitions = []
+        for file in get_dictionary_files(DICTIONARY_FOLDER):
+            with open(file) as fp:
+                definitions.extend(json.loads(s) for s in re.findall(r'ieml: (".*")', fp.read()))
+
+        self.assertGreater(len(definitions), 0)
+        for s in definitions:
+            script = self.parser.parse_reference(s)
+            self.assertIs(descent.parse(s), script)
+
+            for ss in script.singular_sequences:
+                self.assertIs(descent.parse(str(ss)), ss)
+
+        for s in ['', 'U', 'U:X', 'wa:O:.', 'U:.-+', 'U:S:.-A:.', 'wa', 'U:U:U:U:.']:
+            with self.assertRaises(descent.ScriptSyntaxError):
+                descent.parse(s)
+
+    def test_threads(self):
+        scripts = [str(s) for s in sc("M:M:.-O:M:.-'").singular_sequences]
+        expected = [self.parser.parse_reference(s) for s in scripts]
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(self.parser.parse_reference, scripts * 4))
+
+        self.assertTrue(all(r is e for r, e in zip(results, expected * 4)))
+
+    def test_cache(self):
+        self.parser.cache.cache_clear()
+        self.parser.parse("M:M:.")
+        self.parser.parse("M:M:.")
+        info = self.parser.cache.cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (1, 1, 1))
+
+        with self.assertRaises(CannotParse):
+            self.parser.parse('wa:O:.')
+        self.assertEqual(self.parser.cache.cache_info().currsize, 1)
+
+    def test_validate(self):
+        errors = self.parser.validate(["M:M:.", "M:#M:.$", "M:M:.M:M:.M:M:.M:M:.-", "M:M:.+",
+                                       "M:M:.-M:M:.-M:M:.-'M:M:.-M:M:.-M:M:.-'M:M:.-M:M:.-M:M:.-',"])
+
+        self.assertEqual([(e.string, e.position) for e in errors],
+                         [("M:#M:.$", 2), ("M:#M:.$", 6), ("M:M:.M:M:.M:M:.M:M:.-", 15), ("M:M:.+", 6),
+                          ("M:M:.-M:M:.-M:M:.-'M:M:.-M:M:.-M:M:.-'M:M:.-M:M:.-M:M:.-',", 0)])
+
+        # the strings without illegal characters are valid if and only if they can be parsed
+        for s in ["M:M:.", "M:M:.-", "wa.+E:M:.-"]:
+            if self.parser.validate([s]):
+                with self.assertRaises(CannotParse):
+                    self.parser.parse(s)
+            else:
+                self.parser.parse(s)
+
+    def test_parser_tables(self):
+        # the shipped tables must be regenerated with scripts/generate_parser_tables.py after a change of the grammar
+        pdict = {k: getattr(self.parser, k) for k in dir(self.parser)}
+        grammar = yacc.ParserReflect(pdict)
+        grammar.get_all()
+        self.assertEqual(grammar.signature(), importlib.import_module(ScriptParser.tabmodule)._lr_signature)
+
+    def test_parse_many(self):
+        strings = [str(s) for s in sc("M:M:.-O:M:.-'").singular_sequences]
+        strings = strings + ['wa:O:.'] + strings[::-1]
+
+        for workers in (1, 2):
+            results = parse_many(strings, kind='script', workers=workers)
+            self.assertEqual(len(results), len(strings))
+            self.assertIsInstance(results[len(strings) // 2], CannotParse)
+            self.assertTrue(all(r is self.parser.parse(s) for s, r in zip(strings, results)
+                                if not isinstance(r, CannotParse)))
+
+    def test_parse_many_invalid(self):
+        # parses, but has more singular sequences than allowed
+        strings = ['wa.', 'M:M:.M:M:.M:M:.-']
+
+        for workers in (1, 2):
+            results = parse_many(strings, kind='script', workers=workers)
+            self.assertIs(results[0], self.parser.parse('wa.'))
+            self.assertIsInstance(results[1], CannotParse)
+
+    def test_persistent_cache(self):
+        strings = [str(s) for s in sc("M:M:.-O:M:.-'").singular_sequences] + ['wa:O:.']
+
+        with tempfile.TemporaryDirectory() as folder:
+            stale = os.path.join(folder, '.parse-cache.script.0.sqlite')
+            open(stale, 'w').close()
+
+            cache = PersistentParseCache('script', cache_folder=folder)
+            self.assertFalse(os.path.exists(stale))
+
+            results = parse_many(strings, kind='script', workers=1, cache=cache)
+            self.assertEqual(cache.cache_info().currsize, len(strings) - 1)
+            cache.close()
+
+            cache = PersistentParseCache('script', cache_folder=folder)
+            self.assertEqual(parse_many(strings, kind='script', workers=1, cache=cache)[:-1], results[:-1])
+            self.assertIsInstance(results[-1], CannotParse)
+            info = cache.cache_info()
+            self.assertEqual((info.hits, info.misses), (len(strings) - 1, 1))
+
+            self.assertIs(cache.parse(strings[0]), results[0])
+            cache.close()
+
+            # a change of the scripts modules invalidates the cache
+            with mock.patch('ieml.parsing._modules_signature', return_value='0'):
+                cache = PersistentParseCache('script', cache_folder=folder)
+                self.assertEqual(cache.get_encodings(strings), {})
+                cache.close()
+
+    def test_persistent_cache_hit(self):
+        # a cache hit rebuilds the object from its encoding, without parsing
+        for kind, strings in [('script', ["M:M:.-O:M:.-'", 'wa.']),
+                              ('usl', ['[(E:.b.E:B:.-)*(E:S:.)*(E:)]', '[E:.b.E:B:.-]'])]:
+            with tempfile.TemporaryDirectory() as folder:
+                cache = PersistentParseCache(kind, cache_folder=folder)
+                results = parse_many(strings, kind=kind, workers=1, cache=cache)
+
+                with mock.patch('ieml.parsing._parser', side_effect=AssertionError("parsed on a cache hit")):
+                    self.assertEqual([str(cache.parse(s)) for s in strings], [str(r) for r in results])
+                    self.assertEqual([str(r) for r in parse_many(strings, kind=kind, workers=1, cache=cache)],
+                                     [str(r) for r in results])
+                cache.close()
+
+    def test_parse_many_usl(self):
+        strings = ['[(E:.b.E:B:.-)*(E:S:.)*(E:)]', '[E:.b.E:B:.-]', '[(E:.b.E:B:.-)*(E:S:.)*(E:)]']
+        results = parse_many(strings, kind='usl', workers=2)
+        self.assertEqual([str(r) for r in results], [str(usl(s)) for s in strings])
+
 
 # Lot of test to do :
 # - testing invalid ieml construction
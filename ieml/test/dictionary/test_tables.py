@@ -1,5 +1,7 @@
 from unittest import TestCase
 
+import numpy as np
+
 from ieml.dictionary.dictionary import Dictionary
 from ieml.dictionary.table.table import Table
 
@@ -21,4 +23,24 @@ class TestTables(TestCase):
                 self.assertEqual(c.ndim, 3)
 
         # for t in self.d.tables:
-        #     self.assertEqual(t.shape, )
\ No newline at end of file
+        #     self.assertEqual(t.shape, )
+
+    def test_cells_index(self):
+        for s in self.d.scripts:
+            self.assertEqual(len(s.cells_index), len(s.cells))
+            for index, cells in zip(s.cells_index, s.cells):
+                self.assertEqual(index.dtype.kind, 'i')
+                self.assertEqual(index.shape, cells.shape)
+                for i, ss in np.ndenumerate(cells):
+                    self.assertIs(s.singular_sequences[index[i]], ss)
+
+            if len(s.cells_index) == 1:
+                self.assertListEqual(sorted(s.cells_index[0].flatten().tolist()), list(range(s.cardinal)))
+
+            # the object array of the singular sequences is built once
+            self.assertIs(s.singular_sequences_array, s.singular_sequences_array)
+
+        for t in self.d.tables:
+            if t.ndim in (1, 2):
+                for ss in t.script.singular_sequences:
+                    self.assertIs(t[t.index_of(ss)], ss)
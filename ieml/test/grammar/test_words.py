@@ -7,6 +7,7 @@ from ieml.exceptions import InvalidIEMLObjectArgument, CannotParse
 # from ieml.dictionary import term
 # from ieml.lexicon import topic, Word, usl, Topic
 from ieml.lexicon.grammar import Word
+from ieml.lexicon.grammar.parser import IEMLParser
 
 
 class TopicsTest(unittest.TestCase):
@@ -32,4 +33,27 @@ class TopicsTest(unittest.TestCase):
         self.assertIsInstance(u, Word)
         word = "[([l.-T:.U:.-',n.-T:.A:.-',d.-S:.U:.-',_+E:.-U:.s.-l.-'+n.i.-d.i.-t.u.-'+wo.f.A:.-+wu.f.S:.-'+s.-S:+T:.A:.-',_])*([E:])*([E:])]"
         u = usl(word)
-        self.assertIsInstance(u, Word)
\ No newline at end of file
+        self.assertIsInstance(u, Word)
+
+    def test_parse_cache(self):
+        parser = IEMLParser()
+        parser.cache.cache_clear()
+
+        word = "[([E:.b.E:B:.-])*([E:S:.])*([E:])]"
+        self.assertIs(usl(word), usl(word))
+        info = parser.cache.cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (1, 1, 1))
+
+        with self.assertRaises(CannotParse):
+            usl("[([O:M:.]+[wa.]+[M:M:.])*([O:O:.M:O:.-])]")
+        self.assertEqual(parser.cache.cache_info().currsize, 1)
+
+        maxsize = parser.cache.maxsize
+        parser.cache.resize(0)
+        self.assertEqual(parser.cache.cache_info().currsize, 0)
+        parser.cache.resize(maxsize)
+
+    def test_singular_sequences(self):
+        u = usl("[([O:.]+[E:M:.])*([E:S:.])*([E:])]")
+        self.assertEqual(len(u.singular_sequences), 2 * 3)
+        self.assertTrue(all(s in u for s in u.singular_sequences))
@@ -0,0 +1,21 @@
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT_FOLDER = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
+
+# the dependencies that are only imported when their feature is used
+HEAVY_MODULES = ['ply', 'pandas', 'scipy', 'ieml.dictionary.dictionary']
+
+
+class ImportTest(unittest.TestCase):
+    def test_lazy_imports(self):
+        code = "import sys, ieml; print(' '.join(m for m in %r if m in sys.modules))" % HEAVY_MODULES
+        res = subprocess.run([sys.executable, '-c', code], cwd=ROOT_FOLDER, stdout=subprocess.PIPE, check=True)
+        self.assertListEqual(res.stdout.decode('utf8').split(), [], "import ieml imports heavy modules")
+
+    def test_no_side_effect(self):
+        code = "import logging, ieml; print(len(logging.getLogger().handlers), ieml.parse_many.__module__)"
+        res = subprocess.run([sys.executable, '-c', code], cwd=ROOT_FOLDER, stdout=subprocess.PIPE, check=True)
+        self.assertEqual(res.stdout.decode('utf8').split(), ['0', 'ieml.parsing'])
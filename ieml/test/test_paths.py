@@ -1,3 +1,5 @@
+import tempfile
+from unittest import mock
 from unittest.case import TestCase
 
 from ieml.lexicon import Text, Word, Theory, Fact, Topic, topic, fact, text
@@ -6,6 +8,7 @@ from ieml.exceptions import PathError, IEMLObjectResolutionError
 from ieml.lexicon.paths import MultiplicativePath, Coordinate, AdditivePath, ContextPath, path, resolve, enumerate_paths,\
     resolve_ieml_object
 from ieml.lexicon.tools import random_usl, usl
+from ieml.parsing import parse_many, PersistentParseCache
 
 
 class TestPaths(TestCase):
@@ -50,6 +53,22 @@ class TestPaths(TestCase):
             }
         }))
 
+    def test_parse_many(self):
+        strings = ["t:sa:sa0:f", "f15684", "t0:(s0a0 + s0m0):s:f + t1:s:s:(r+f)", "t:(s+s)a"]
+        for workers in (1, 2):
+            results = parse_many(strings, kind='path', workers=workers)
+            self.assertEqual([str(r) for r in results], [str(path(s)) for s in strings])
+            self.assertEqual([r.__class__ for r in results], [path(s).__class__ for s in strings])
+
+        with tempfile.TemporaryDirectory() as folder:
+            cache = PersistentParseCache('path', cache_folder=folder)
+            results = parse_many(strings, kind='path', workers=1, cache=cache)
+
+            # a cache hit rebuilds the path from its encoding, without parsing
+            with mock.patch('ieml.parsing._parser', side_effect=AssertionError("parsed on a cache hit")):
+                self.assertEqual([str(cache.parse(s)) for s in strings], [str(r) for r in results])
+            cache.close()
+
     def test_context(self):
         with self.assertRaises(PathError):
             p = path("sma")
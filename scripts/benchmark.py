@@ -0,0 +1,227 @@
+import os
+import subprocess
+import sys
+import tempfile
+from statistics import median
+
+from ieml.constants import DICTIONARY_FOLDER
+
+ROOT_FOLDER = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+def _time_in_subprocess(code: str, library: str = ROOT_FOLDER, hash_seed: str = None) -> float:
+    """
+    Run code in a fresh python interpreter, to measure cold timings (empty parser caches and intern table).
+    The code must print the measured time in seconds as its last output line.
+
+    :param library: the folder of the ieml library to import
+    :param hash_seed: the PYTHONHASHSEED of the interpreter, to reproduce the iteration order of the sets
+    """
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(p for p in [library, env.get('PYTHONPATH')] if p)
+    if hash_seed is not None:
+        env['PYTHONHASHSEED'] = hash_seed
+
+    # python -c imports from the working directory first
+    res = subprocess.run([sys.executable, '-c', code], env=env, check=True, cwd=library,
+                         stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    return float(res.stdout.decode('utf8').strip().split('\n')[-1])
+
+
+def _report(name: str, timings) -> None:
+    print("{:<40} median {:.3f}s  min {:.3f}s  ({} runs)".format(name, median(timings), min(timings), len(timings)))
+
+
+def benchmark_load(args) -> None:
+    """Cold Dictionary.load without the cache."""
+    code = """
+import time
+from ieml.dictionary.dictionary import Dictionary
+t = time.perf_counter()
+Dictionary.load({!r}, use_cache=False)
+print(time.perf_counter() - t)
+""".format(args.dictionary_folder)
+
+    _report('Dictionary.load(use_cache=False)', [_time_in_subprocess(code) for _ in range(args.repeat)])
+
+
+def benchmark_load_cache(args) -> None:
+    """Dictionary.load from the cache snapshot, then the first access to its scripts, tables and relations."""
+    with tempfile.TemporaryDirectory() as tmp:
+        code = """
+import time
+from ieml.dictionary.dictionary import Dictionary
+t = time.perf_counter()
+d = Dictionary.load({!r}, cache_folder={!r})
+{}
+print(time.perf_counter() - t)
+"""
+        # write the cache
+        _time_in_subprocess(code.format(args.dictionary_folder, tmp, ''))
+
+        _report('Dictionary.load(use_cache=True)',
+                [_time_in_subprocess(code.format(args.dictionary_folder, tmp, '')) for _ in range(args.repeat)])
+        _report('  + scripts, tables and relations',
+                [_time_in_subprocess(code.format(args.dictionary_folder, tmp, 'd.tables; d.relations'))
+                 for _ in range(args.repeat)])
+
+
+def benchmark_import(args) -> None:
+    """Import the script constructor, and build the parser with the first parse."""
+    code = """
+import time
+t = time.perf_counter()
+from ieml.dictionary.script import script
+print(time.perf_counter() - t)
+"""
+    _report('from ieml.dictionary.script import script', [_time_in_subprocess(code) for _ in range(args.repeat)])
+
+    code = """
+import time
+from ieml.dictionary.script import script
+t = time.perf_counter()
+script("M:M:.-O:M:.-'")
+print(time.perf_counter() - t)
+"""
+    _report('first script() call', [_time_in_subprocess(code) for _ in range(args.repeat)])
+
+
+def benchmark_tables(args) -> None:
+    """Build the tables of every script of the dictionary."""
+    code = """
+import time
+from ieml.dictionary.dictionary import Dictionary
+from ieml.dictionary.script import script
+scripts = [script(str(s)) for s in Dictionary.load({!r}).scripts]
+for s in scripts:
+    s._cells = s._cells_index = s._tables_script = None
+t = time.perf_counter()
+for s in scripts:
+    s.tables_script
+print(time.perf_counter() - t)
+""".format(args.dictionary_folder)
+
+    _report('Script tables of the dictionary', [_time_in_subprocess(code) for _ in range(args.repeat)])
+
+
+def _dump_dictionary_scripts(args, file: str) -> None:
+    """Write the list of the (string, binary encoding) of the dictionary scripts in file."""
+    _time_in_subprocess("""
+import pickle
+from ieml.dictionary.dictionary import Dictionary
+scripts = Dictionary.load({!r}).scripts
+with open({!r}, 'wb') as fp:
+    pickle.dump([(str(s), s.to_bytes()) for s in scripts], fp)
+print(0)
+""".format(args.dictionary_folder, file))
+
+
+# decode all the scripts of the file with the expression, with an empty intern table
+_DECODE_SCRIPTS_CODE = """
+import pickle
+import time
+from ieml.dictionary.script import ScriptParser, from_bytes
+from ieml.dictionary.script.parser import descent
+with open({!r}, 'rb') as fp:
+    scripts = pickle.load(fp)
+parser = ScriptParser()
+t = time.perf_counter()
+result = [{} for string, encoding in scripts]
+print(time.perf_counter() - t)
+"""
+
+
+def _report_decode(args, file: str, name: str, expression: str) -> None:
+    _report(name, [_time_in_subprocess(_DECODE_SCRIPTS_CODE.format(file, expression)) for _ in range(args.repeat)])
+
+
+def benchmark_bytes(args) -> None:
+    """Decode the scripts of the dictionary with the parser and from their binary encoding."""
+    with tempfile.TemporaryDirectory() as tmp:
+        file = os.path.join(tmp, 'scripts.pickle')
+        _dump_dictionary_scripts(args, file)
+
+        _report_decode(args, file, 'ScriptParser().parse', 'parser.parse(string)')
+        _report_decode(args, file, 'from_bytes', 'from_bytes(encoding)')
+
+
+def benchmark_parse(args) -> None:
+    """Parse the scripts of the dictionary with the descent parser and the PLY parser."""
+    with tempfile.TemporaryDirectory() as tmp:
+        file = os.path.join(tmp, 'scripts.pickle')
+        _dump_dictionary_scripts(args, file)
+
+        _report_decode(args, file, 'descent.parse', 'descent.parse(string)')
+        _report_decode(args, file, 'ScriptParser().parse_reference', 'parser.parse_reference(string)')
+
+
+def benchmark_factorize(args) -> None:
+    """Factorize every paradigm of the dictionary and the rows and columns of its tables. If a reference library is
+    given, the same inputs are factorized with it and the results compared."""
+    code = """
+import time
+from ieml.dictionary.dictionary import Dictionary
+from ieml.dictionary.script import factorize
+d = Dictionary.load({!r})
+inputs = [[s] for s in d.scripts if s.cardinal != 1]
+for t in d.tables:
+    if t.ndim == 2:
+        inputs.extend([list(line) for line in t.cells] + [list(line) for line in t.cells.transpose()])
+t = time.perf_counter()
+results = [factorize(i) for i in inputs]
+duration = time.perf_counter() - t
+with open({!r}, 'w') as fp:
+    fp.write('\\n'.join(sorted(' '.join(str(s) for s in i) + ' -> ' + str(r) for i, r in zip(inputs, results))))
+print(duration)
+"""
+
+    libraries = [('factorize', ROOT_FOLDER)]
+    if args.reference:
+        libraries.append(('factorize (reference)', os.path.abspath(args.reference)))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        outputs = []
+        for name, library in libraries:
+            file = os.path.join(tmp, '{}.txt'.format(len(outputs)))
+            _report(name, [_time_in_subprocess(code.format(args.dictionary_folder, file), library=library,
+                                               hash_seed=args.hash_seed) for _ in range(args.repeat)])
+            with open(file) as fp:
+                outputs.append(fp.read().split('\n'))
+
+        if args.reference:
+            # the lines are sorted by input
+            identical = sum(1 for r0, r1 in zip(*outputs) if r0 == r1)
+            print("{} identical results over {}".format(identical, len(outputs[0])))
+
+
+BENCHMARKS = {
+    'bytes': benchmark_bytes,
+    'factorize': benchmark_factorize,
+    'import': benchmark_import,
+    'parse': benchmark_parse,
+    'load': benchmark_load,
+    'load_cache': benchmark_load_cache,
+    'tables': benchmark_tables,
+}
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Time the costly operations of the ieml library')
+
+    parser.add_argument('benchmarks', type=str, nargs='*', choices=[[]] + sorted(BENCHMARKS),
+                        help='the benchmarks to run, all if none is given')
+    parser.add_argument('--dictionary-folder', type=str, required=False, default=DICTIONARY_FOLDER,
+                        help='the dictionary definition folder')
+    parser.add_argument('--repeat', type=int, required=False, default=3,
+                        help='the number of runs of each benchmark')
+    parser.add_argument('--reference', type=str, required=False, default=None,
+                        help='the folder of another version of the library to compare the results with')
+    parser.add_argument('--hash-seed', type=str, required=False, default='0',
+                        help='the PYTHONHASHSEED of the compared runs')
+
+    args = parser.parse_args()
+
+    for name in args.benchmarks or sorted(BENCHMARKS):
+        BENCHMARKS[name](args)
@@ -0,0 +1,46 @@
+import importlib
+import logging
+import sys
+
+import ply.yacc as yacc
+
+# the PLY parsers of the library, their LALR tables are shipped as the python module named by their tabmodule
+PARSERS = [
+    ('ieml.dictionary.script.parser.parser', 'ScriptParser'),
+    ('ieml.lexicon.grammar.parser.parser', 'IEMLParser'),
+    ('ieml.lexicon.paths.parser.parser', 'PathParser'),
+]
+
+
+def generate_parser_tables(parsers=PARSERS):
+    """
+    Write the tabmodule of each parser in its package, if it is missing or its grammar signature has changed.
+
+    :return: the list of the parsers that could not be imported
+    """
+    failed = []
+    for module, name in parsers:
+        try:
+            instance = getattr(importlib.import_module(module), name)()
+        except ImportError as e:
+            print("Unable to import %s.%s: %s" % (module, name, str(e)), file=sys.stderr)
+            failed.append(name)
+            continue
+
+        # without optimize, the tables are rebuilt and written if the signature of the grammar has changed
+        yacc.yacc(module=instance, errorlog=logging, start=instance.start, tabmodule=instance.tabmodule,
+                  debug=False, optimize=False, write_tables=True)
+        print("%s tables in %s" % (name, instance.tabmodule), file=sys.stderr)
+
+    return failed
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Generate the LALR tables modules of the ieml parsers, to run '
+                                                 'after a change of a grammar')
+    parser.parse_args()
+
+    if generate_parser_tables():
+        sys.exit(1)
@@ -125,8 +125,8 @@ def normalize_dictionary_file(file, expand_root=False):
             for ss in set(paradigms) - set(paradigms_file):
                 d['Paradigms'].append({'ieml': ss, 'translations': {'fr': "", 'en': ""}})
 
-    d['Semes'] = sorted(d['Semes'], key=lambda ss: semes_root[ss['ieml']])
-    d['Paradigms'] = sorted(d['Paradigms'], key=lambda ss: script(ss['ieml']))
+    d['Semes'] = sorted(d['Semes'], key=lambda ss: semes_root[ss['ieml']].sort_key)
+    d['Paradigms'] = sorted(d['Paradigms'], key=lambda ss: script(ss['ieml']).sort_key)
 
     r = _serialize_root_paradigm(d['RootParadigm'],
                                  d['RootParadigm']['inhibitions'],
@@ -1,4 +1,5 @@
 import sys
+from itertools import chain
 
 from multiprocessing import Process, Queue
 
@@ -6,6 +7,7 @@ from logging import ERROR, NOTSET
 from pykwalify import core
 
 from ieml.dictionary import Dictionary
+from ieml.dictionary.script import ScriptParser
 from scripts.normalize_dictionary import normalize_dictionary_file
 
 core.log.level = NOTSET
@@ -14,7 +16,7 @@ from pykwalify.core import Core
 from pykwalify.errors import SchemaError
 
 from ieml.constants import DICTIONARY_SCHEMA_FILE, DICTIONARY_FOLDER
-from ieml.dictionary.dictionary import get_dictionary_files
+from ieml.dictionary.dictionary import get_dictionary_files, read_dictionary_file
 
 
 def validate_schema(folder=DICTIONARY_FOLDER):
@@ -50,6 +52,29 @@ def validate_schema(folder=DICTIONARY_FOLDER):
     return True
 
 
+def validate_scripts(folder=DICTIONARY_FOLDER):
+    """
+    Check the scripts of the dictionary files. Every illegal character of every script is reported, but the parsing
+    of a script stops at its first syntax error : a script with several syntax errors needs several runs.
+    """
+    strings = []
+    files = {}
+    for f in get_dictionary_files(folder=folder):
+        d = read_dictionary_file(f)
+
+        for s in chain([d['RootParadigm']], d['Semes'], d['Paradigms']):
+            strings.append(s['ieml'])
+            files.setdefault(s['ieml'], f)
+
+    # all the scripts are checked in one pass, every error is reported
+    errors = ScriptParser().validate(strings)
+    for e in errors:
+        print("Validation error in '{}': invalid script '{}' at position {}, {}".format(
+            files[e.string], e.string, e.position, e.message), file=sys.stderr)
+
+    return not errors
+
+
 def validate_normalization(folder=DICTIONARY_FOLDER):
     for f in get_dictionary_files(folder=folder):
         with open(f) as fp:
@@ -79,6 +104,11 @@ def validate(folder=DICTIONARY_FOLDER):
               file=sys.stderr)
         return False
 
+    if not validate_scripts(folder):
+        print("A dictionary file contains an invalid script.",
+              file=sys.stderr)
+        return False
+
     if not validate_normalization(folder):
         print("A dictionary file is not normalized, it has inconsistent indentation or fields order. Please run "
               "'python script/normalize_dictionary.py' to fix this error",
@@ -96,7 +126,8 @@ def validate(folder=DICTIONARY_FOLDER):
 if __name__ == '__main__':
     import argparse
 
-    parser = argparse.ArgumentParser(description='Validate the dictionary files')
+    parser = argparse.ArgumentParser(description='Validate the dictionary files. All the invalid scripts are reported, '
+                                                 'with the first syntax error of each script.')
 
     parser.add_argument('--dictionary-folder', type=str, required=False, default=DICTIONARY_FOLDER,
                         help='the dictionary definition folder')